@@ -0,0 +1,207 @@
+"""
+Mesures de performance reproductibles de projet.py.
+
+    python benchmark.py                          # lance les mesures et les affiche
+    python benchmark.py --sauver base.json       # enregistre les mesures comme reference
+    python benchmark.py --comparer base.json     # echoue (code 1) si une mesure regresse
+    python benchmark.py --comparer base.json --seuil 0.2 --filtre minmax
+
+Chaque mesure est le meilleur de plusieurs essais, sur des positions fixes et avec des
+graines fixes. Une reference ne vaut que pour la machine qui l'a produite : elle ne doit
+pas etre partagee d'une machine a l'autre.
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+
+from projet import *
+
+
+class Mesure:
+    """
+    Resultat d'une mesure : valeur, unite et sens ('haut' si une plus grande valeur est meilleure)
+    """
+    def __init__(self, valeur, unite, sens='haut'):
+        self.valeur = valeur
+        self.unite = unite
+        self.sens = sens
+
+    def versDict(self):
+        return {'valeur': self.valeur, 'unite': self.unite, 'sens': self.sens}
+
+
+def meilleurTemps(fonction, repetitions, duree_min=0.2):
+    """
+    Rend le temps (en secondes) d'un appel a fonction : chaque essai appelle fonction assez
+    de fois pour durer au moins duree_min, et on garde le meilleur de repetitions essais
+    """
+    nb = 1
+    while True:
+        debut = time.perf_counter()
+        for _ in range(nb):
+            fonction()
+        duree = time.perf_counter() - debut
+        if duree >= duree_min:
+            break
+        nb = max(2 * nb, int(nb * 1.2 * duree_min / duree)) if duree > 0 else 10 * nb
+    meilleur = duree / nb
+    for _ in range(repetitions - 1):
+        debut = time.perf_counter()
+        for _ in range(nb):
+            fonction()
+        meilleur = min(meilleur, (time.perf_counter() - debut) / nb)
+    return meilleur
+
+
+################################################################################################################################################################
+
+def positionMorpion():
+    """
+    Morpion apres X en 5 et O en 1 (position fixe du milieu de partie)
+    """
+    jeu = Morpion()
+    jeu.joueLeCoup(5)
+    jeu.joueLeCoup(1)
+    return jeu
+
+
+POSITIONS_MINMAX = {
+    'morpion_vide': (Morpion, (1, 2, 3, 4, 5)),
+    'morpion_milieu': (positionMorpion, (2, 4, 6)),
+    'allumettes_3x5': (lambda: Allumettes(3, 5), (1, 2, 3)),
+    'allumettes_5x5': (lambda: Allumettes(5, 5), (1, 2)),
+    'puissance4_vide': (Puissance4, (2, 4, 5)),
+}
+
+
+def mesurerMinMax(repetitions, elagage):
+    """
+    Noeuds par seconde de StrategieMinMax (sans table) pour un coup depuis chaque position fixe
+    """
+    mesures = {}
+    for nom, (fabrique, horizons) in POSITIONS_MINMAX.items():
+        for horizon in horizons:
+            jeu = fabrique()
+            strategie = StrategieMinMax(jeu, horizon, elagage=elagage, rng=random.Random(0))
+            temps = meilleurTemps(lambda: strategie.choisirProchainCoup(jeu.plateau), repetitions)
+            cle = f"minmax{'_ab' if elagage else ''}_{nom}_h{horizon}"
+            mesures[cle] = Mesure(strategie.noeuds / temps, 'noeuds/s')
+    return mesures
+
+
+def mesurerGrundy(repetitions):
+    """
+    Temps d'un appel a valeurGrundy selon le nombre de groupes (nim et variante {1, 3, 4})
+    """
+    mesures = {}
+    tirage = random.Random(0)
+    for retraits, nom in ((None, 'nim'), ((1, 3, 4), 'retraits134')):
+        for g in (10, 100, 1000, 10000):
+            jeu = Allumettes(g, 1000, retraits)
+            jeu.plateau = [tirage.randint(0, 1000) for _ in range(g)]
+            strategie = StrategieAllumettes(jeu)
+            temps = meilleurTemps(lambda: strategie.valeurGrundy(jeu.plateau), repetitions)
+            mesures[f"grundy_{nom}_g{g}"] = Mesure(temps * 1e6, 'us/appel', 'bas')
+    return mesures
+
+
+def mesurerParties(repetitions):
+    """
+    Parties par seconde entre deux StrategieAleatoire (moteur jouerPartie, sans affichage)
+    """
+    mesures = {}
+    jeux = {'morpion': Morpion, 'allumettes_3x5': lambda: Allumettes(3, 5), 'mnk_5x5x4': lambda: MorpionMNK(5, 5, 4),
+            'puissance4': Puissance4}
+    for nom, fabrique in jeux.items():
+        nb = 100
+        def mesure():
+            rng = random.Random(0)
+            for _ in range(nb):
+                jouerPartie(fabrique, lambda jeu: StrategieAleatoire(jeu, rng), lambda jeu: StrategieAleatoire(jeu, rng))
+        temps = meilleurTemps(mesure, repetitions)
+        mesures[f"parties_{nom}"] = Mesure(nb / temps, 'parties/s')
+    return mesures
+
+
+GROUPES = {
+    'minmax': lambda repetitions: mesurerMinMax(repetitions, False),
+    'minmax_ab': lambda repetitions: mesurerMinMax(repetitions, True),
+    'grundy': mesurerGrundy,
+    'parties': mesurerParties,
+}
+
+
+################################################################################################################################################################
+
+def lancer(filtre=None, repetitions=3):
+    """
+    Lance les groupes de mesures dont le nom contient filtre (tous si None)
+    """
+    mesures = {}
+    for nom, groupe in GROUPES.items():
+        if filtre is None or filtre in nom:
+            mesures.update(groupe(repetitions))
+    return mesures
+
+
+def sauver(mesures, chemin):
+    donnees = {'machine': platform.node(), 'processeur': platform.processor() or platform.machine(),
+               'python': platform.python_version(), 'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+               'mesures': {nom: mesure.versDict() for nom, mesure in mesures.items()}}
+    with open(chemin, 'w') as fichier:
+        json.dump(donnees, fichier, indent=2, sort_keys=True)
+
+
+def comparer(mesures, chemin, seuil):
+    """
+    Compare les mesures a la reference enregistree dans chemin et rend la liste des
+    regressions de plus de seuil (0.1 : 10 %)
+    """
+    with open(chemin) as fichier:
+        reference = json.load(fichier)['mesures']
+    regressions = []
+    for nom, mesure in mesures.items():
+        if nom not in reference:
+            continue
+        avant = reference[nom]['valeur']
+        # ecart relatif, positif quand la mesure est meilleure que la reference
+        if mesure.sens == 'haut':
+            ecart = mesure.valeur / avant - 1
+        else:
+            ecart = avant / mesure.valeur - 1
+        etat = 'REGRESSION' if ecart < -seuil else ''
+        print(f"{nom:40s} {avant:14.2f} -> {mesure.valeur:14.2f} {mesure.unite:10s} {ecart:+8.1%} {etat}")
+        if etat:
+            regressions.append(nom)
+    return regressions
+
+
+def main(arguments=None):
+    parseur = argparse.ArgumentParser(description="Mesures de performance de projet.py")
+    parseur.add_argument('--sauver', metavar='FICHIER', help="enregistre les mesures comme reference (JSON)")
+    parseur.add_argument('--comparer', metavar='FICHIER', help="compare a une reference et echoue en cas de regression")
+    parseur.add_argument('--seuil', type=float, default=0.1, help="regression toleree (defaut : 0.1, soit 10 %%)")
+    parseur.add_argument('--filtre', help="ne lance que les groupes dont le nom contient ce texte : " + ", ".join(GROUPES))
+    parseur.add_argument('--repetitions', type=int, default=3, help="nombre d'essais par mesure (on garde le meilleur)")
+    args = parseur.parse_args(arguments)
+
+    mesures = lancer(args.filtre, args.repetitions)
+    if args.comparer:
+        regressions = comparer(mesures, args.comparer, args.seuil)
+    else:
+        for nom, mesure in mesures.items():
+            print(f"{nom:40s} {mesure.valeur:14.2f} {mesure.unite}")
+        regressions = []
+    if args.sauver:
+        sauver(mesures, args.sauver)
+    if regressions:
+        print(len(regressions), "regression(s) de plus de", f"{args.seuil:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
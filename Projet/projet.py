@@ -1,3 +1,66 @@
+import array
+import bisect
+import concurrent.futures
+import itertools
+import json
+import math
+import mmap
+import multiprocessing
+from multiprocessing import shared_memory
+import os
+import random
+import struct
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+try:
+    import numpy as np
+except ImportError: # numpy n'est utile qu'aux simulations vectorisees
+    np = None
+
+INFINI = float('inf')
+MASQUE_64 = (1 << 64) - 1
+
+
+class TempsEcoule(Exception):
+    """
+    Levee quand le temps accorde a une recherche est depasse
+    """
+
+
+def tableZobrist(n, m, graine=0):
+    """
+    Rend une table n x m de nombres aleatoires sur 64 bits, toujours la meme
+    pour une graine donnee (les hash restent comparables entre processus).
+    La graine identifie le jeu, ex : 'MorpionMNK(7, 7, 5)' : deux jeux differents
+    ont ainsi des hash differents et peuvent partager une TableTransposition.
+    """
+    rng = random.Random(graine)
+    return [[rng.getrandbits(64) for _ in range(m)] for _ in range(n)]
+
+ZOBRIST_TRAIT = random.Random(-1).getrandbits(64) # change le joueur courant
+
+class ZobristGroupes(dict):
+    """
+    Nombres aleatoires sur 64 bits des couples (groupe, nombre d'allumettes),
+    calcules (splitmix64) a la premiere demande : les groupes peuvent etre tres grands.
+    graine identifie le jeu (voir tableZobrist).
+    """
+    def __init__(self, graine=0):
+        super().__init__()
+        self.graine = random.Random(graine).getrandbits(64)
+
+    def __missing__(self, cle):
+        i, n = cle
+        z = (((i << 48) ^ n) ^ self.graine) * 0x9E3779B97F4A7C15 & 0xFFFFFFFFFFFFFFFF
+        z = (z ^ (z >> 30)) * 0xBF58476D1CE4E5B9 & 0xFFFFFFFFFFFFFFFF
+        z = (z ^ (z >> 27)) * 0x94D049BB133111EB & 0xFFFFFFFFFFFFFFFF
+        z ^= z >> 31
+        self[cle] = z
+        return z
+
 class JeuSequentiel:
     """
     Represente un jeu sequentiel, a somme
@@ -27,6 +90,40 @@ class JeuSequentiel:
         """
         raise NotImplementedError
 
+    def f1Lot(self, configurations):
+        """
+        Rend la liste des evaluations f1 de plusieurs
+        configurations (en un seul appel). La recherche
+        utilise plutot f1Fils, qui ne construit pas les fils
+        """
+        return [self.f1(C) for C in configurations]
+
+    def f1Fils(self, coups):
+        """
+        Rend la liste des f1 des configurations obtenues
+        en jouant chacun des coups depuis la configuration courante
+        (feuilles de l'horizon evaluees en un appel par StrategieMinMax)
+        """
+        valeurs = []
+        for coup in coups:
+            self.joueLeCoup(coup)
+            valeurs.append(self.f1(self.plateau))
+            self.annuleLeCoup(coup)
+        return valeurs
+
+    def partiesAleatoires(self, n, generateur):
+        """
+        Joue ensemble (numpy) n parties aleatoires depuis la
+        configuration courante, non finie : coups tires uniformement
+        par generateur (numpy.random.Generator), comme StrategieAleatoire.
+        Rend [egalites, victoires de X, victoires de O].
+        LOT_ALEATOIRES est le nombre de parties a partir duquel
+        c'est plus rapide que de les jouer une a une
+        """
+        raise NotImplementedError
+
+    LOT_ALEATOIRES = 1
+
     def joueLeCoup(self, C, coup):
         """
         Rend la configuration obtenue apres
@@ -35,6 +132,13 @@ class JeuSequentiel:
         """
         raise NotImplementedError
 
+    def annuleLeCoup(self, coup):
+        """
+        Annule le coup qui vient d'etre joue par
+        joueLeCoup (le jeu est modifie en place)
+        """
+        raise NotImplementedError
+
     def estFini(self, C):
         """
         Rend True si la configuration C est
@@ -42,70 +146,219 @@ class JeuSequentiel:
         """
         raise NotImplementedError
     
+    def rang(self, C):
+        """
+        Rend le numero (entre 0 et nombreRangs() - 1)
+        de la configuration C et du joueur courant
+        """
+        raise NotImplementedError
+
+    def nombreRangs(self):
+        """
+        Rend le nombre de numeros possibles
+        des configurations (voir rang)
+        """
+        raise NotImplementedError
+
+    def parametres(self):
+        """
+        Rend le dictionnaire des arguments qui recreent
+        le jeu dans sa configuration initiale
+        """
+        raise NotImplementedError
+
+    def encoderCoup(self, coup):
+        """
+        Rend l'entier positif (petit) qui represente
+        le coup dans un JournalParties
+        """
+        raise NotImplementedError
+
+    def decoderCoup(self, n):
+        """
+        Rend le coup represente par l'entier n
+        (inverse de encoderCoup)
+        """
+        raise NotImplementedError
+
     def afficher_plateau(self,C):
         raise NotImplementedError
     
 ################################################################################################################################################################
 
+ZOBRIST_MORPION = tableZobrist(9, 2, 'Morpion') # [case][X ou O]
+
+# Une configuration du morpion est codee par l'entier sum(v_i * 3**i) ou v_i vaut
+# 0 (case libre), 1 (X) ou 2 (O) pour la case i (coup i+1). Les resultats de estFini,
+# f1, f2 et coupsPossibles sont precalcules pour les 3**9 codes.
+PUISSANCES_3 = [3 ** i for i in range(9)]
+VALEUR_CASE = {'X': 1, 'O': 2}
+LIGNES_MORPION = [(0, 1, 2), (3, 4, 5), (6, 7, 8), # lignes
+                  (0, 3, 6), (1, 4, 7), (2, 5, 8), # colonnes
+                  (0, 4, 8), (2, 4, 6)]            # diagonales
+
+def _tablesMorpion():
+    fin, f1, f2, coups = [], [], [], []
+    for cases in itertools.product((0, 1, 2), repeat=9):
+        cases = cases[::-1] # la case 0 varie le plus vite
+        gagnant = False
+        for a, b, c in LIGNES_MORPION:
+            if cases[a] and cases[a] == cases[b] == cases[c]:
+                gagnant = 'X' if cases[a] == 1 else 'O'
+                break
+        libres = [i + 1 for i in range(9) if not cases[i]]
+        if not gagnant and not libres:
+            gagnant = True # plateau plein
+        fin.append(gagnant)
+        # nombre de lignes avec 2 pions d'un joueur et aucun de l'autre
+        f1.append(sum(1 for l in LIGNES_MORPION if [cases[i] for i in l].count(1) == 2 and 2 not in [cases[i] for i in l]))
+        f2.append(sum(1 for l in LIGNES_MORPION if [cases[i] for i in l].count(2) == 2 and 1 not in [cases[i] for i in l]))
+        coups.append(tuple(libres))
+    return fin, f1, f2, coups
+
+FIN_MORPION, F1_MORPION, F2_MORPION, COUPS_MORPION = _tablesMorpion()
+# 0 : partie en cours, 1 : X gagne, 2 : O gagne, 3 : egalite (pour les tableaux numpy)
+RESULTATS_MORPION = [3 if fin is True else VALEUR_CASE[fin] if fin else 0 for fin in FIN_MORPION]
+
+def _symetriesMorpion():
+    """
+    Rend les 8 permutations des cases du morpion (rotations et reflexions) :
+    la case i va en perm[i].
+    """
+    rotation = [3 * (i % 3) + 2 - i // 3 for i in range(9)]
+    reflexion = [3 * (i // 3) + 2 - i % 3 for i in range(9)]
+    symetries = []
+    perm = list(range(9))
+    for _ in range(4):
+        symetries.append(perm)
+        symetries.append([reflexion[p] for p in perm])
+        perm = [rotation[p] for p in perm]
+    return symetries
+
+SYMETRIES_MORPION = _symetriesMorpion()
+_TABLES_SYMETRIE_MORPION = []
+
+def tablesSymetrieMorpion():
+    """
+    Rend (et calcule au premier appel) les tables code -> code canonique et
+    code -> hash de Zobrist de la configuration canonique. Le code canonique est
+    le plus petit code parmi les 8 configurations symetriques.
+    """
+    if not _TABLES_SYMETRIE_MORPION:
+        canonique, hash_canonique = [], []
+        for cases in itertools.product((0, 1, 2), repeat=9):
+            cases = cases[::-1]
+            code = min(sum(cases[i] * PUISSANCES_3[perm[i]] for i in range(9) if cases[i]) for perm in SYMETRIES_MORPION)
+            canonique.append(code)
+            h, c, pions = 0, code, 0
+            for i in range(9):
+                c, v = divmod(c, 3)
+                if v:
+                    h ^= ZOBRIST_MORPION[i][v - 1]
+                    pions += 1
+            hash_canonique.append(h ^ ZOBRIST_TRAIT if pions % 2 else h)
+        _TABLES_SYMETRIE_MORPION.extend((canonique, hash_canonique))
+    return _TABLES_SYMETRIE_MORPION
+
+_TABLES_NUMPY = {}
+
+def _tableNumpy(nom, table):
+    """
+    Rend (une fois construite) la copie numpy de la table nom, pour les evaluations par lot
+    """
+    if nom not in _TABLES_NUMPY:
+        _TABLES_NUMPY[nom] = np.array(table)
+    return _TABLES_NUMPY[nom]
+
 class Morpion(JeuSequentiel):
     """
     Représente le jeu du morpion (3x3).
+    Le plateau reste une liste de listes de chaines, doublee du code entier
+    de la configuration (self.code) qui sert d'indice dans les tables.
     """
     def __init__(self):
         super().__init__()
         self.plateau = [[str(i + 1) for i in range(j * 3, (j + 1) * 3)] for j in range(3)]
         self.joueur = 'X'  # X commence toujours
+        self.code = 0 # code de self.plateau
+        self.hash = 0 # hash de Zobrist de la configuration et du joueur courant
+
+    def encoder(self, C):
+        """
+        Rend le code entier de la configuration C (plateau ou code)
+        """
+        if C is self.plateau:
+            return self.code
+        if isinstance(C, int):
+            return C
+        code = 0
+        for i, case in enumerate(case for ligne in C for case in ligne):
+            code += VALEUR_CASE.get(case, 0) * PUISSANCES_3[i]
+        return code
+
+    def canonique(self, C):
+        """
+        Rend le code canonique de C : deux configurations egales a une rotation
+        ou reflexion pres ont le meme code canonique
+        """
+        return tablesSymetrieMorpion()[0][self.encoder(C)]
+
+    def hashCanonique(self, C):
+        """
+        Rend le hash de Zobrist de la configuration canonique de C
+        """
+        return tablesSymetrieMorpion()[1][self.encoder(C)]
 
     def joueurCourant(self, C):
         return self.joueur
 
+    def rang(self, C):
+        # Le joueur courant se déduit du nombre de pions
+        return self.encoder(C)
+
+    def nombreRangs(self):
+        return 3 ** 9
+
     def coupsPossibles(self, C):
-        return [int(coup) for row in C for coup in row if coup.isdigit()]
+        return list(COUPS_MORPION[self.encoder(C)])
 
     def f1(self, C):
-        # Compter le nombre de 2 alignements pour le joueur 'X' sans être bloqué par 'O'.
-        alignements = 0
-
-        # Vérifier les lignes
-        for ligne in C:
-            if ligne.count('X') == 2 and 'O' not in ligne:
-                alignements += 1
-
-        # Vérifier les colonnes
-        for col in range(3):
-            if [C[ligne][col] for ligne in range(3)].count('X') == 2 and 'O' not in [C[ligne][col] for ligne in range(3)]:
-                alignements += 1
-
-        # Vérifier les diagonales
-        if [C[i][i] for i in range(3)].count('X') == 2 and 'O' not in [C[i][i] for i in range(3)]:
-            alignements += 1
-        if [C[i][2-i] for i in range(3)].count('X') == 2 and 'O' not in [C[i][2-i] for i in range(3)]:
-            alignements += 1
-
-        return alignements
+        # Nombre de 2 alignements pour le joueur 'X' sans être bloqué par 'O'.
+        return F1_MORPION[self.encoder(C)]
     
     def f2(self, C):
-        # Compter le nombre de 2 alignements pour le joueur 'O' sans être bloqué par 'X'.
-        alignements = 0
-
-        # Vérifier les lignes
-        for ligne in C:
-            if ligne.count('O') == 2 and 'X' not in ligne:
-                alignements += 1
+        # Nombre de 2 alignements pour le joueur 'O' sans être bloqué par 'X'.
+        return F2_MORPION[self.encoder(C)]
 
-        # Vérifier les colonnes
-        for col in range(3):
-            if [C[ligne][col] for ligne in range(3)].count('O') == 2 and 'X' not in [C[ligne][col] for ligne in range(3)]:
-                alignements += 1
-
-        # Vérifier les diagonales
-        if [C[i][i] for i in range(3)].count('O') == 2 and 'X' not in [C[i][i] for i in range(3)]:
-            alignements += 1
-        if [C[i][2-i] for i in range(3)].count('O') == 2 and 'X' not in [C[i][2-i] for i in range(3)]:
-            alignements += 1
+    def f1Lot(self, configurations):
+        """
+        Rend les f1 de plusieurs configurations : liste de configurations ou de codes,
+        ou tableau numpy de codes (le resultat est alors un tableau numpy)
+        """
+        if np is not None and isinstance(configurations, np.ndarray):
+            return _tableNumpy('F1_MORPION', F1_MORPION)[configurations]
+        encoder = self.encoder
+        return [F1_MORPION[encoder(C)] for C in configurations]
 
-        return alignements
+    def f1Fils(self, coups):
+        valeur = VALEUR_CASE[self.joueur]
+        code = self.code
+        return [F1_MORPION[code + valeur * PUISSANCES_3[coup - 1]] for coup in coups]
 
+    def partiesAleatoires(self, n, generateur):
+        """
+        Chaque partie remplit les cases libres dans un ordre tire au hasard : les codes
+        successifs sont des sommes cumulees, et la partie s'arrete au premier code final.
+        """
+        libres = np.array(COUPS_MORPION[self.code], dtype=np.intp) - 1
+        cases = libres[np.argsort(generateur.random((n, len(libres))), axis=1)]
+        valeur = VALEUR_CASE[self.joueur]
+        alternance = np.where(np.arange(len(libres)) % 2 == 0, valeur, 3 - valeur)
+        etats = _tableNumpy('RESULTATS_MORPION', RESULTATS_MORPION)[
+            self.code + np.cumsum(_tableNumpy('PUISSANCES_3', PUISSANCES_3)[cases] * alternance, axis=1)]
+        resultats = etats[np.arange(n), (etats != 0).argmax(axis=1)] # le dernier coup finit toujours la partie
+        comptes = np.bincount(resultats, minlength=4)
+        return [int(comptes[3]), int(comptes[1]), int(comptes[2])]
 
     def joueLeCoup(self, coup):
         """
@@ -113,36 +366,41 @@ class Morpion(JeuSequentiel):
         Args:
             coup (int): Le numéro du coup choisi par le joueur.
         """
-        coup = str(coup)  # Convertir en chaîne pour la comparaison
-        for i in range(3):
-            for j in range(3):
-                if self.plateau[i][j] == coup:
-                    self.plateau[i][j] = self.joueur
-                    self.joueur = 'O' if self.joueur == 'X' else 'X'
-                    return
+        coup = int(coup)
+        if not 1 <= coup <= 9:
+            return
+        i, j = divmod(coup - 1, 3)
+        if self.plateau[i][j] == str(coup):
+            self.plateau[i][j] = self.joueur
+            self.code += VALEUR_CASE[self.joueur] * PUISSANCES_3[coup - 1]
+            self.hash ^= ZOBRIST_MORPION[coup - 1][self.joueur == 'O'] ^ ZOBRIST_TRAIT
+            self.joueur = 'O' if self.joueur == 'X' else 'X'
+
+    def annuleLeCoup(self, coup):
+        """
+        Annule le dernier coup joue (la case coup redevient libre).
+        Args:
+            coup (int): Le numéro du dernier coup joué.
+        """
+        coup = int(coup)
+        i, j = divmod(coup - 1, 3)
+        self.joueur = self.plateau[i][j]
+        self.code -= VALEUR_CASE[self.joueur] * PUISSANCES_3[coup - 1]
+        self.hash ^= ZOBRIST_MORPION[coup - 1][self.joueur == 'O'] ^ ZOBRIST_TRAIT
+        self.plateau[i][j] = str(coup)
 
     def estFini(self, C):
-        # Vérifie les lignes
-        for ligne in C:
-            if ligne[0] == ligne[1] == ligne[2] and ligne[0] in 'XO':
-                return ligne[0]
-
-        # Vérifie les colonnes
-        for col in range(3):
-            if C[0][col] == C[1][col] == C[2][col] and C[0][col] in 'XO':
-                return C[0][col]
-
-        # Vérifie les diagonales
-        if (C[0][0] == C[1][1] == C[2][2] or C[0][2] == C[1][1] == C[2][0]) and C[1][1] in 'XO':
-            return C[1][1]
-
-        # Vérifie si le plateau est plein (aucun chiffre restant)
-        if not any(c.isdigit() for row in C for c in row):
-            return True
+        # Rend le gagnant ('X' ou 'O'), True si le plateau est plein, False sinon
+        return FIN_MORPION[self.encoder(C)]
 
-        # Aucun gagnant et le plateau n'est pas plein
-        return False
+    def parametres(self):
+        return {}
 
+    def encoderCoup(self, coup):
+        return int(coup) - 1
+
+    def decoderCoup(self, n):
+        return n + 1
 
     def afficher_plateau(self,plateau):
         """
@@ -158,18 +416,439 @@ class Morpion(JeuSequentiel):
 
 ################################################################################################################################################################
 
+class MorpionMNK(JeuSequentiel):
+    """
+    Représente le morpion généralisé : plateau de m lignes et n colonnes,
+    il faut aligner k pions (ex : 7x7 avec 5 alignés, gomoku 15x15).
+    Chaque fenêtre de k cases alignées garde son nombre de X et de O, mis à
+    jour par joueLeCoup/annuleLeCoup : un coup ne touche que les fenêtres
+    qui contiennent sa case (au plus 4k), sans parcourir le plateau.
+    De même, la liste triée des cases libres donne les coups possibles.
+    """
+    def __init__(self, m=3, n=3, k=3):
+        super().__init__()
+        if k > max(m, n):
+            raise ValueError("Impossible d'aligner " + str(k) + " pions sur un plateau " + str(m) + "x" + str(n))
+        self.m, self.n, self.k = m, n, k
+        self.plateau = [[str(i + 1) for i in range(j * n, (j + 1) * n)] for j in range(m)]
+        self.joueur = 'X'  # X commence toujours
+        self.zobrist = tableZobrist(m * n, 2, f'MorpionMNK({m}, {n}, {k})')
+        self.hash = 0
+
+        # Fenêtres de k cases alignées (horizontales, verticales, diagonales)
+        self.fenetres = []
+        for i in range(m):
+            for j in range(n):
+                for di, dj in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    if 0 <= i + (k - 1) * di < m and 0 <= j + (k - 1) * dj < n:
+                        self.fenetres.append(tuple((i + t * di) * n + j + t * dj for t in range(k)))
+        self.fenetres_case = [[] for _ in range(m * n)]
+        for w, fenetre in enumerate(self.fenetres):
+            for case in fenetre:
+                self.fenetres_case[case].append(w)
+
+        # Etat incrémental
+        self.nb_X = [0] * len(self.fenetres)
+        self.nb_O = [0] * len(self.fenetres)
+        self.alignements_X = 0 # fenêtres avec k-1 X et aucun O (f1)
+        self.alignements_O = 0 # fenêtres avec k-1 O et aucun X (f2)
+        self.gagnant = False
+        self.gagnants = [] # valeurs précédentes de self.gagnant, pour annuleLeCoup
+        self.libres = list(range(1, m * n + 1)) # cases libres, dans l'ordre croissant
+
+    def joueurCourant(self, C):
+        return self.joueur
+
+    def coupsPossibles(self, C):
+        if C is self.plateau:
+            return self.libres[:]
+        return [int(case) for ligne in C for case in ligne if case.isdigit()]
+
+    def f1(self, C):
+        # Nombre de k-1 alignements pour le joueur 'X' sans être bloqué par 'O'.
+        if C is self.plateau:
+            return self.alignements_X
+        return self._parcourir(C)[1]
+
+    def f2(self, C):
+        # Nombre de k-1 alignements pour le joueur 'O' sans être bloqué par 'X'.
+        if C is self.plateau:
+            return self.alignements_O
+        return self._parcourir(C)[2]
+
+    def estFini(self, C):
+        # Rend le gagnant ('X' ou 'O'), True si le plateau est plein, False sinon
+        if C is self.plateau:
+            if self.gagnant:
+                return self.gagnant
+            return not self.libres
+        return self._parcourir(C)[0]
+
+    def _parcourir(self, C):
+        """
+        Calcule (estFini, f1, f2) en parcourant toutes les fenêtres d'une
+        configuration C quelconque.
+        """
+        cases = [case for ligne in C for case in ligne]
+        gagnant, f1, f2 = False, 0, 0
+        for fenetre in self.fenetres:
+            contenu = [cases[c] for c in fenetre]
+            x, o = contenu.count('X'), contenu.count('O')
+            if not gagnant and (x == self.k or o == self.k):
+                gagnant = 'X' if x == self.k else 'O'
+            if o == 0 and x == self.k - 1:
+                f1 += 1
+            if x == 0 and o == self.k - 1:
+                f2 += 1
+        if not gagnant and not any(case.isdigit() for case in cases):
+            gagnant = True
+        return gagnant, f1, f2
+
+    def joueLeCoup(self, coup):
+        """
+        Joue un coup sur le plateau en remplaçant le numéro par le symbole du joueur.
+        Args:
+            coup (int): Le numéro du coup choisi par le joueur.
+        """
+        coup = int(coup)
+        if not 1 <= coup <= self.m * self.n:
+            return
+        i, j = divmod(coup - 1, self.n)
+        if self.plateau[i][j] != str(coup):
+            return
+        k = self.k
+        self.gagnants.append(self.gagnant)
+        if self.joueur == 'X':
+            nb_joueur, nb_adversaire = self.nb_X, self.nb_O
+        else:
+            nb_joueur, nb_adversaire = self.nb_O, self.nb_X
+        pour_joueur = pour_adversaire = 0 # variations des k-1 alignements
+        for w in self.fenetres_case[coup - 1]:
+            nb = nb_joueur[w] + 1
+            nb_joueur[w] = nb
+            if nb_adversaire[w] == 0:
+                if nb == k - 1:
+                    pour_joueur += 1
+                elif nb == k:
+                    pour_joueur -= 1
+                    if not self.gagnant:
+                        self.gagnant = self.joueur
+            elif nb == 1 and nb_adversaire[w] == k - 1:
+                pour_adversaire -= 1
+        if self.joueur == 'X':
+            self.alignements_X += pour_joueur
+            self.alignements_O += pour_adversaire
+        else:
+            self.alignements_O += pour_joueur
+            self.alignements_X += pour_adversaire
+        self.plateau[i][j] = self.joueur
+        del self.libres[bisect.bisect_left(self.libres, coup)]
+        self.hash ^= self.zobrist[coup - 1][self.joueur == 'O'] ^ ZOBRIST_TRAIT
+        self.joueur = 'O' if self.joueur == 'X' else 'X'
+
+    def annuleLeCoup(self, coup):
+        """
+        Annule le dernier coup joué (la case coup redevient libre).
+        Args:
+            coup (int): Le numéro du dernier coup joué.
+        """
+        coup = int(coup)
+        i, j = divmod(coup - 1, self.n)
+        self.joueur = self.plateau[i][j]
+        self.hash ^= self.zobrist[coup - 1][self.joueur == 'O'] ^ ZOBRIST_TRAIT
+        self.plateau[i][j] = str(coup)
+        bisect.insort(self.libres, coup)
+        k = self.k
+        if self.joueur == 'X':
+            nb_joueur, nb_adversaire = self.nb_X, self.nb_O
+        else:
+            nb_joueur, nb_adversaire = self.nb_O, self.nb_X
+        pour_joueur = pour_adversaire = 0
+        for w in self.fenetres_case[coup - 1]:
+            nb = nb_joueur[w]
+            nb_joueur[w] = nb - 1
+            if nb_adversaire[w] == 0:
+                if nb == k - 1:
+                    pour_joueur -= 1
+                elif nb == k:
+                    pour_joueur += 1
+            elif nb == 1 and nb_adversaire[w] == k - 1:
+                pour_adversaire += 1
+        if self.joueur == 'X':
+            self.alignements_X += pour_joueur
+            self.alignements_O += pour_adversaire
+        else:
+            self.alignements_O += pour_joueur
+            self.alignements_X += pour_adversaire
+        self.gagnant = self.gagnants.pop()
+
+    def parametres(self):
+        return {'m': self.m, 'n': self.n, 'k': self.k}
+
+    def encoderCoup(self, coup):
+        return int(coup) - 1
+
+    def decoderCoup(self, n):
+        return n + 1
+
+    def afficher_plateau(self, plateau):
+        """
+        Affiche le plateau de jeu.
+        Args:
+        plateau (list[list[str]]): Configuration actuelle du plateau.
+        """
+        largeur = len(str(self.m * self.n))
+        print()
+        for ligne in plateau:
+            texte = " | ".join(case.rjust(largeur) for case in ligne)
+            print(texte)
+            print("-" * len(texte))
+        print()
+
+################################################################################################################################################################
+
+class Puissance4(JeuSequentiel):
+    """
+    Représente le Puissance 4 sur un plateau de lignes x colonnes (6x7 par défaut).
+    Un coup est le numéro (à partir de 1) de la colonne où tombe le pion.
+    Les pions de chaque joueur sont aussi rangés dans un entier (bitboard) : la case
+    (colonne c, ligne r en partant du bas) est le bit c*(lignes+1) + r, la ligne de trop
+    de chaque colonne restant vide pour que les décalages ne passent pas d'une colonne à
+    l'autre. Quatre pions alignés se testent alors en quelques décalages (alignement),
+    et les coups possibles sont lus dans une table indexée par les colonnes pleines.
+    """
+    def __init__(self, lignes=6, colonnes=7):
+        super().__init__()
+        if lignes < 4 and colonnes < 4:
+            raise ValueError("Impossible d'aligner 4 pions sur un plateau " + str(lignes) + "x" + str(colonnes))
+        self.lignes, self.colonnes = lignes, colonnes
+        self.plateau = [['.'] * colonnes for _ in range(lignes)] # ligne 0 en haut
+        self.joueur = 'X'  # X commence toujours
+        self.zobrist = tableZobrist(lignes * colonnes, 2, f'Puissance4({lignes}, {colonnes})') # [colonne * lignes + ligne][X ou O]
+        self.hash = 0
+        self.hash_miroir = 0 # hash de la configuration symétrique (colonnes inversées)
+        self.pions = {'X': 0, 'O': 0} # bitboards
+        self.hauteurs = [c * (lignes + 1) for c in range(colonnes)] # bit de la prochaine case libre
+        self.pleines = 0 # bit c : colonne c pleine
+        self.nb_coups = 0
+        self.gagnant = False
+        # cases jouables (sans la ligne de trop) et ordre des colonnes, du centre vers les bords
+        self.cases = sum(((1 << lignes) - 1) << (c * (lignes + 1)) for c in range(colonnes))
+        self.ordre = sorted(range(1, colonnes + 1), key=lambda c: abs(2 * c - colonnes - 1))
+        self.coups = {} # colonnes pleines -> coups possibles
+
+    def joueurCourant(self, C):
+        return self.joueur
+
+    def bitboards(self, C):
+        """
+        Rend les bitboards (X, O) de la configuration C
+        """
+        if C is self.plateau:
+            return self.pions['X'], self.pions['O']
+        pions = {'X': 0, 'O': 0, '.': 0}
+        for i, ligne in enumerate(C):
+            r = self.lignes - 1 - i
+            for c, case in enumerate(ligne):
+                pions[case] |= 1 << (c * (self.lignes + 1) + r)
+        return pions['X'], pions['O']
+
+    def alignement(self, b):
+        """
+        Rend True si le bitboard b contient 4 pions alignés
+        """
+        for s in (1, self.lignes, self.lignes + 1, self.lignes + 2): # vertical, diagonale, horizontal, diagonale
+            m = b & (b >> s)
+            if m & (m >> 2 * s):
+                return True
+        return False
+
+    def menaces(self, b, occupees):
+        """
+        Rend le bitboard des cases libres qui compléteraient 4 pions alignés avec ceux de b
+        """
+        r = (b << 1) & (b << 2) & (b << 3)
+        for s in (self.lignes, self.lignes + 1, self.lignes + 2):
+            p = (b << s) & (b << 2 * s)
+            r |= p & (b << 3 * s)
+            r |= p & (b >> s)
+            p = (b >> s) & (b >> 2 * s)
+            r |= p & (b << s)
+            r |= p & (b >> 3 * s)
+        return r & self.cases & ~occupees
+
+    def coupsPossibles(self, C):
+        if C is self.plateau:
+            pleines = self.pleines
+        else:
+            pleines = sum(1 << c for c in range(self.colonnes) if C[0][c] != '.')
+        coups = self.coups.get(pleines)
+        if coups is None:
+            coups = self.coups[pleines] = tuple(c for c in self.ordre if not pleines >> (c - 1) & 1)
+        return list(coups)
+
+    def f1(self, C):
+        # Nombre de cases libres où un X alignerait 4 pions
+        X, O = self.bitboards(C)
+        return self.menaces(X, X | O).bit_count()
+
+    def f2(self, C):
+        # Nombre de cases libres où un O alignerait 4 pions
+        X, O = self.bitboards(C)
+        return self.menaces(O, X | O).bit_count()
+
+    def f1Fils(self, coups):
+        X, O = self.pions['X'], self.pions['O']
+        occupees = X | O
+        valeurs = []
+        for coup in coups:
+            b = 1 << self.hauteurs[coup - 1]
+            valeurs.append(self.menaces(X | b if self.joueur == 'X' else X, occupees | b).bit_count())
+        return valeurs
+
+    def estFini(self, C):
+        # Rend le gagnant ('X' ou 'O'), True si le plateau est plein, False sinon
+        if C is self.plateau:
+            if self.gagnant:
+                return self.gagnant
+            return self.nb_coups == self.lignes * self.colonnes
+        X, O = self.bitboards(C)
+        if self.alignement(X):
+            return 'X'
+        if self.alignement(O):
+            return 'O'
+        return (X | O) == self.cases
+
+    def joueLeCoup(self, coup):
+        """
+        Fait tomber un pion du joueur courant dans la colonne coup (rien si elle est pleine).
+        Args:
+            coup (int): Le numéro de la colonne choisie par le joueur.
+        """
+        c = int(coup) - 1
+        if not 0 <= c < self.colonnes or self.pleines >> c & 1:
+            return
+        bit = self.hauteurs[c]
+        r = bit - c * (self.lignes + 1)
+        self.hauteurs[c] = bit + 1
+        if r == self.lignes - 1:
+            self.pleines |= 1 << c
+        pions = self.pions[self.joueur] | (1 << bit)
+        self.pions[self.joueur] = pions
+        self.plateau[self.lignes - 1 - r][c] = self.joueur
+        o = self.joueur == 'O'
+        self.hash ^= self.zobrist[c * self.lignes + r][o] ^ ZOBRIST_TRAIT
+        self.hash_miroir ^= self.zobrist[(self.colonnes - 1 - c) * self.lignes + r][o] ^ ZOBRIST_TRAIT
+        self.nb_coups += 1
+        if self.alignement(pions):
+            self.gagnant = self.joueur
+        self.joueur = 'X' if o else 'O'
+
+    def annuleLeCoup(self, coup):
+        """
+        Annule le dernier coup joué (le pion du haut de la colonne coup est retiré).
+        Args:
+            coup (int): Le numéro de la colonne du dernier coup joué.
+        """
+        c = int(coup) - 1
+        bit = self.hauteurs[c] - 1
+        r = bit - c * (self.lignes + 1)
+        self.hauteurs[c] = bit
+        self.pleines &= ~(1 << c)
+        self.joueur = 'O' if self.joueur == 'X' else 'X'
+        self.pions[self.joueur] ^= 1 << bit
+        self.plateau[self.lignes - 1 - r][c] = '.'
+        o = self.joueur == 'O'
+        self.hash ^= self.zobrist[c * self.lignes + r][o] ^ ZOBRIST_TRAIT
+        self.hash_miroir ^= self.zobrist[(self.colonnes - 1 - c) * self.lignes + r][o] ^ ZOBRIST_TRAIT
+        self.nb_coups -= 1
+        self.gagnant = False # la partie continuait avant ce coup
+
+    def canonique(self, C):
+        """
+        Rend le même entier pour une configuration et sa symétrique (colonnes inversées)
+        """
+        return self.hashCanonique(C)
+
+    def hashCanonique(self, C):
+        if C is self.plateau:
+            return min(self.hash, self.hash_miroir)
+        h = h_miroir = 0
+        nb = 0
+        for i, ligne in enumerate(C):
+            r = self.lignes - 1 - i
+            for c, case in enumerate(ligne):
+                if case != '.':
+                    h ^= self.zobrist[c * self.lignes + r][case == 'O']
+                    h_miroir ^= self.zobrist[(self.colonnes - 1 - c) * self.lignes + r][case == 'O']
+                    nb += 1
+        if nb % 2:
+            h ^= ZOBRIST_TRAIT
+            h_miroir ^= ZOBRIST_TRAIT
+        return min(h, h_miroir)
+
+    def parametres(self):
+        return {'lignes': self.lignes, 'colonnes': self.colonnes}
+
+    def encoderCoup(self, coup):
+        return int(coup) - 1
+
+    def decoderCoup(self, n):
+        return n + 1
+
+    def afficher_plateau(self, plateau):
+        """
+        Affiche le plateau de jeu, avec les numéros des colonnes en dessous.
+        Args:
+        plateau (list[list[str]]): Configuration actuelle du plateau.
+        """
+        print()
+        for ligne in plateau:
+            print(" | ".join(ligne))
+        print("-" * (4 * self.colonnes - 3))
+        print(" | ".join(str(c % 10) for c in range(1, self.colonnes + 1)))
+        print()
+
+################################################################################################################################################################
+
 class Allumettes(JeuSequentiel):
     """
     Représente le jeu des allumettes pour g groupes de m allumettes chacun.
+    Par défaut on retire autant d'allumettes que l'on veut d'un groupe. Pour une
+    variante, retraits donne les quantités autorisées, ex : {1, 3, 4}, ou
+    range(1, k + 1) pour « au plus k » (1 doit en faire partie pour finir la partie).
     """
-    def __init__(self, g: int, m: int):
+    def __init__(self, g: int, m: int, retraits=None):
         super().__init__()
+        if retraits is not None:
+            retraits = tuple(sorted(set(retraits)))
+            if not retraits or retraits[0] != 1:
+                raise ValueError("Les retraits autorisés doivent contenir 1")
+        self.retraits = retraits
+        self.m = m
         self.plateau = [m] * g
         self.joueur = 'X'  # Le joueur 1 commence toujours
+        # [groupe, nombre d'allumettes] ; les valeurs ne dependent pas de g ni de m, seulement des retraits
+        self.zobrist = ZobristGroupes(f'Allumettes({retraits})')
+        self.hash = 0
+        for i in range(g):
+            self.hash ^= self.zobrist[i, m]
 
     def joueurCourant(self, C):
         return self.joueur
 
+    def rang(self, C):
+        """
+        Rend le numéro de C (écriture en base m+1) et du joueur courant.
+        """
+        r = 0
+        for nb_allumettes in reversed(C):
+            r = r * (self.m + 1) + nb_allumettes
+        return 2 * r + (self.joueur == 'O')
+
+    def nombreRangs(self):
+        return 2 * (self.m + 1) ** len(self.plateau)
+
     def coupsPossibles(self, C):
         """
         Rend la liste des coups possibles dans la configuration C.
@@ -177,7 +856,9 @@ class Allumettes(JeuSequentiel):
         """
         coups_possibles = []
         for i, nb_allumettes in enumerate(C):
-            for j in range(1, nb_allumettes + 1):
+            for j in (range(1, nb_allumettes + 1) if self.retraits is None else self.retraits):
+                if j > nb_allumettes:
+                    break
                 coups_possibles.append((i, j))
         return coups_possibles
 
@@ -189,6 +870,27 @@ class Allumettes(JeuSequentiel):
         # Une simple évaluation basée sur le nombre d'allumettes restantes dans le jeu
         return sum(C)
 
+    def f1Lot(self, configurations):
+        """
+        Rend les f1 de plusieurs configurations : liste de configurations, ou tableau
+        numpy (une ligne par configuration, le résultat est alors un tableau numpy).
+        """
+        if np is not None and isinstance(configurations, np.ndarray):
+            return configurations.sum(axis=1)
+        return [sum(C) for C in configurations]
+
+    def f1Fils(self, coups):
+        total = sum(self.plateau)
+        return [total - nombre_allumettes for _, nombre_allumettes in coups]
+
+    LOT_ALEATOIRES = 16 # une etape numpy par coup : rentable a partir de quelques dizaines de parties
+
+    def partiesAleatoires(self, n, generateur):
+        entier, retraits = _typesAllumettes(sum(self.plateau), self.retraits)
+        groupes = np.repeat(np.array(self.plateau, dtype=entier)[:, None], n, axis=1)
+        premier, second = _partiesAllumettes(groupes, retraits, generateur, entier)
+        return [0, premier, second] if self.joueur == 'X' else [0, second, premier]
+
     def joueLeCoup(self, coup, affichage=False):
         """
         Joue un coup en retirant un certain nombre d'allumettes d'un groupe.
@@ -196,197 +898,1382 @@ class Allumettes(JeuSequentiel):
             coup (tuple): Le coup à jouer, représenté par un tuple (index_groupe, nombre_allumettes).
         """
         index_groupe, nombre_allumettes = coup
+        avant = self.plateau[index_groupe]
         self.plateau[index_groupe] -= nombre_allumettes
+        self.hash ^= self.zobrist[index_groupe, avant] ^ self.zobrist[index_groupe, avant - nombre_allumettes] ^ ZOBRIST_TRAIT
         if affichage: print("Le joueur ",self.joueur," a enlevé ",nombre_allumettes," dans le groupe ",index_groupe+1,"\n")
         self.joueur = 'O' if self.joueur == 'X' else 'X'
 
+    def annuleLeCoup(self, coup):
+        """
+        Annule le dernier coup joue en remettant les allumettes dans leur groupe.
+        Args:
+            coup (tuple): Le dernier coup joué (index_groupe, nombre_allumettes).
+        """
+        index_groupe, nombre_allumettes = coup
+        avant = self.plateau[index_groupe]
+        self.plateau[index_groupe] += nombre_allumettes
+        self.hash ^= self.zobrist[index_groupe, avant] ^ self.zobrist[index_groupe, avant + nombre_allumettes] ^ ZOBRIST_TRAIT
+        self.joueur = 'O' if self.joueur == 'X' else 'X'
+
     def estFini(self, C):
         """
         Rend True si la configuration C est une configuration finale.
         """
         if all(nb == 0 for nb in C): return self.joueur
         return False
+
+    def parametres(self):
+        return {'g': len(self.plateau), 'm': self.m, 'retraits': None if self.retraits is None else list(self.retraits)}
+
+    def encoderCoup(self, coup):
+        # (groupe i, j allumettes) -> i*m + j-1, car 1 <= j <= m
+        index_groupe, nombre_allumettes = coup
+        return index_groupe * self.m + nombre_allumettes - 1
+
+    def decoderCoup(self, n):
+        index_groupe, reste = divmod(n, self.m)
+        return (index_groupe, reste + 1)
     
-    def afficher_plateau(self):
+    def afficher_plateau(self, C=None):
         """
-        Affiche l'état actuel du jeu, y compris le plateau et le joueur courant.
+        Affiche l'état du jeu (par défaut le plateau courant).
         """
-        for i, nb_allumettes in enumerate(self.plateau):
+        for i, nb_allumettes in enumerate(self.plateau if C is None else C):
             print(f"Groupe {i + 1}: {'|' * nb_allumettes} ({nb_allumettes} allumettes)")
 
 
 ################################################################################################################################################################
 
-class Strategie:
+class TableTransposition:
     """
-    Represente une strategie de jeu
+    Table de transposition de taille bornee pour StrategieMinMax.
+    Une cle (hash, profondeur restante, joueur de la racine) est associee a une
+    valeur et a son type : exacte, borne inferieure ou borne superieure.
+    Quand la table est pleine, on evince selon la politique choisie :
+        - 'profondeur' : une entree de plus faible profondeur restante (la plus ancienne)
+        - 'lru' : l'entree utilisee le moins recemment
+    La meme table peut etre donnee a plusieurs strategies, d'un coup a l'autre
+    et d'une partie a l'autre, y compris a des recherches menees en meme temps
+    dans plusieurs threads (les acces sont proteges par un verrou).
+    La cle ne contient pas le jeu : une table ne peut etre partagee entre jeux differents
+    (classes ou dimensions) que si chacun tire ses nombres de Zobrist de sa propre graine
+    (tableZobrist, ZobristGroupes), comme les jeux de ce module.
     """
-    def __init__(self,jeu:JeuSequentiel):
-        self.jeu = jeu
-
-    def choisirProchainCoup(self, C):
+    EXACTE, INFERIEURE, SUPERIEURE = 0, 1, 2
+
+    def __init__(self, taille_max=1000000, politique='profondeur'):
+        if politique not in ('profondeur', 'lru'):
+            raise ValueError("Politique d'eviction inconnue : " + str(politique))
+        self.taille_max = taille_max
+        self.politique = politique
+        self.entrees = OrderedDict()
+        self.par_profondeur = {} # profondeur -> cles de cette profondeur, de la plus ancienne a la plus recente
+        self.succes = 0
+        self.echecs = 0
+        self.evictions = 0
+        self.verrou = threading.Lock()
+
+    def __len__(self):
+        return len(self.entrees)
+
+    def __getstate__(self):
+        etat = self.__dict__.copy()
+        del etat['verrou'] # chaque copie (ex : dans un autre processus) a son propre verrou
+        return etat
+
+    def __setstate__(self, etat):
+        self.__dict__.update(etat)
+        self.verrou = threading.Lock()
+
+    def chercher(self, cle):
         """
-        Choisit un coup parmi les coups possibles dans la configuration C
+        Rend le couple (valeur, type) associe a cle, ou None
         """
-        raise NotImplementedError
-    
-    def decision(self,jeu,listecv):
-        raise NotImplementedError
-        
-    def estimation(self,jeu,coup,profondeur):
-        raise NotImplementedError
-        
-    def maxValue(jeu,profondeur):
-        raise NotImplementedError
-    
-    def minValue(jeu,profondeur):
-        raise NotImplementedError       
-        
-################################################################################################################################################################    
+        with self.verrou:
+            entree = self.entrees.get(cle)
+            if entree is None:
+                self.echecs += 1
+                return None
+            self.succes += 1
+            if self.politique == 'lru':
+                self.entrees.move_to_end(cle)
+            return entree
+
+    def stocker(self, cle, valeur, type_valeur):
+        with self.verrou:
+            if cle in self.entrees:
+                self.entrees[cle] = (valeur, type_valeur)
+                if self.politique == 'lru':
+                    self.entrees.move_to_end(cle)
+                return
+            if len(self.entrees) >= self.taille_max:
+                self.evincer()
+            self.entrees[cle] = (valeur, type_valeur)
+            if self.politique == 'profondeur':
+                self.par_profondeur.setdefault(cle[1], OrderedDict())[cle] = None
+
+    def evincer(self):
+        """
+        Retire une entree selon la politique (a appeler avec le verrou pris)
+        """
+        if self.politique == 'lru':
+            self.entrees.popitem(last=False)
+        else:
+            profondeur = min(p for p, cles in self.par_profondeur.items() if cles)
+            cle, _ = self.par_profondeur[profondeur].popitem(last=False)
+            del self.entrees[cle]
+        self.evictions += 1
 
-class StrategieAleatoire(Strategie):
-    """
-    Represente une strategie de jeu
-    """
-    def __init__(self,jeu:JeuSequentiel):
-        super().__init__(jeu)
+    def vider(self):
+        with self.verrou:
+            self.entrees.clear()
+            self.par_profondeur.clear()
 
-    def choisirProchainCoup(self, C):
+    def statistiques(self):
         """
-        Choisit un coup parmi les coups possibles dans la configuration C
+        Rend les compteurs de la table (pour la dimensionner)
         """
-        import random
-        coups_possibles=self.jeu.coupsPossibles(C)
-        if coups_possibles:
-            return random.choice(coups_possibles)
-        else:
-            print("Aucun coup dispo")
-            return None
+        octets = self.octets()
+        return {'entrees': len(self.entrees), 'taille_max': self.taille_max, 'succes': self.succes,
+                'echecs': self.echecs, 'evictions': self.evictions, 'octets': octets,
+                'octets_par_entree': octets / len(self.entrees) if self.entrees else None}
+
+    def octets(self):
+        """
+        Rend la memoire occupee par les entrees (dictionnaires, cles et valeurs)
+        """
+        with self.verrou:
+            total = sys.getsizeof(self.entrees) + sum(sys.getsizeof(cles) for cles in self.par_profondeur.values())
+            for cle, entree in self.entrees.items():
+                total += sys.getsizeof(cle) + sys.getsizeof(cle[0]) + sys.getsizeof(entree) + sys.getsizeof(entree[0])
+        return total
 
 ################################################################################################################################################################
 
-class StrategieMinMax(Strategie):
+class CachePartage:
     """
-    Represente un strategie utilisant un arbre min-max de profondeur k
+    Table de transposition en memoire partagee (multiprocessing.shared_memory), lue et ecrite
+    par tous les processus sans serialisation : meme interface que TableTransposition.
+    C'est une table a adressage ouvert de capacite cases (une puissance de 2) de 16 octets :
+    hash ^ donnee puis donnee, ou donnee (64 bits) contient la valeur (entiere, 32 bits),
+    son type, la profondeur restante et le joueur de la racine.
+    Ecritures concurrentes : pas de verrou, la derniere ecriture l'emporte. Une case ecrite par
+    deux processus a la fois (hash de l'un, donnee de l'autre) ne verifie plus hash ^ donnee
+    et est vue comme absente : on perd au pire une entree, jamais on ne lit une valeur fausse.
+    Une cle est cherchee dans SONDES cases consecutives ; quand elles sont toutes prises, on
+    remplace celle de plus faible profondeur restante.
+    La table est transmise aux processus (ex : tournoiParallele(..., table=cache)) par son nom.
     """
-    def __init__(self, jeu: JeuSequentiel, k: int):#, ...):
-        super().__init__(jeu)
-        self.jeu = jeu
-        self.horizon=k
-        
-    def choisirProchainCoup(self, C):
-        global joueur, horizon
-        horizon= self.horizon
-        joueur = self.jeu.joueur
-        liste=self.jeu.coupsPossibles(C)
-        cp=self.decision(self.jeu,liste)
-        #print("cp:",cp)
-        if (cp==[]):
-            return []
-        return cp
-        
-    def decision(self,jeu,listecv):
-        max_score=-1000000000000000000000
-    
-        if joueur == 'X':
-            bestone=listecv[0]
-        else: 
-            bestone=listecv[-1]
-    
-        est_list = []
+    SONDES = 4
+    OCTETS_PAR_CASE = 16
+
+    def __init__(self, capacite=1 << 20, nom=None):
+        if capacite & (capacite - 1):
+            raise ValueError("La capacite doit etre une puissance de 2")
+        self.capacite = capacite
+        self.masque = capacite - 1
+        self.proprietaire = nom is None
+        if nom is None:
+            self.memoire = shared_memory.SharedMemory(create=True, size=capacite * self.OCTETS_PAR_CASE)
+            self.memoire.buf[:capacite * self.OCTETS_PAR_CASE] = bytes(capacite * self.OCTETS_PAR_CASE)
+        else:
+            self.memoire = shared_memory.SharedMemory(name=nom)
+        self.cases = self.memoire.buf[:capacite * self.OCTETS_PAR_CASE].cast('Q')
+        self.succes = 0 # compteurs propres a chaque processus
+        self.echecs = 0
 
-        for coup in listecv:
-            val=self.estimation(jeu,coup, horizon)
-            est_list.append(val)
-            #print(coup,val)
-            if val>max_score:
-                max_score=val
-                bestone=coup
+    @classmethod
+    def attacher(cls, nom, capacite):
+        """
+        Rend le cache partage de nom donne (cree par un autre processus), attache
+        une seule fois par processus
+        """
+        if nom not in _CACHES_ATTACHES:
+            _CACHES_ATTACHES[nom] = cls(capacite, nom)
+        return _CACHES_ATTACHES[nom]
 
-        best_list = []
-        for i in range(len(listecv)):
-            if est_list[i] == max_score:
-                best_list.append(listecv[i])
-        #print("BESTONE : ",score)
-        import random
-        return random.choice(best_list)
+    def __reduce__(self):
+        return (CachePartage.attacher, (self.memoire.name, self.capacite))
 
-    def estimation(self,jeu,coup,profondeur):
-        import copy
-        jeuclone=copy.deepcopy(jeu)
-        jeuclone.joueLeCoup(coup)
-        if profondeur==0:
-            #return self.evaluation(jeuclone)
-            return jeuclone.f1(jeuclone.plateau)
-        result=jeuclone.estFini(jeuclone.plateau)
-        if result:
-            if result=='X':
-                return 100000 #bcp psq win condition
-            elif result=='O':
-                return -100000 #loose
-            else:
-                return -1000 #draw
-        if jeuclone.joueur == joueur:
-            return self.maxValue(jeuclone,profondeur)
-        else :
-            return self.minValue(jeuclone,profondeur)
+    @staticmethod
+    def emballer(valeur, type_valeur, profondeur, joueur):
+        return (((valeur + (1 << 31)) << 32) | (profondeur << 8) | (type_valeur << 2)
+                | ((joueur == 'O') << 1) | 1)
 
+    def indice(self, h, profondeur):
+        return (h ^ (profondeur * 0x9E3779B97F4A7C15)) & self.masque
 
-    def maxValue(self,jeu,profondeur):
-        liste=jeu.coupsPossibles(jeu.plateau)
+    def chercher(self, cle):
+        """
+        Rend le couple (valeur, type) associe a cle, ou None
+        """
+        h, profondeur, joueur = cle
+        h &= MASQUE_64
+        controle = (profondeur << 8) | ((joueur == 'O') << 1) | 1
+        cases = self.cases
+        i = self.indice(h, profondeur)
+        for _ in range(self.SONDES):
+            donnee = cases[2 * i + 1]
+            if donnee & 0xFF03 == controle and cases[2 * i] ^ donnee == h:
+                self.succes += 1
+                return (donnee >> 32) - (1 << 31), (donnee >> 2) & 3
+            i = (i + 1) & self.masque
+        self.echecs += 1
+        return None
+
+    def stocker(self, cle, valeur, type_valeur):
+        h, profondeur, joueur = cle
+        if type(valeur) is not int or not -(1 << 31) <= valeur < (1 << 31) or not 0 <= profondeur < 256:
+            return # seules les valeurs entieres sur 32 bits sont gardees
+        h &= MASQUE_64
+        donnee = self.emballer(valeur, type_valeur, profondeur, joueur)
+        controle = donnee & 0xFF03
+        cases = self.cases
+        i = self.indice(h, profondeur)
+        choisie = i
+        profondeur_choisie = 256
+        for _ in range(self.SONDES):
+            ancienne = cases[2 * i + 1]
+            if not ancienne or (ancienne & 0xFF03 == controle and cases[2 * i] ^ ancienne == h):
+                choisie = i # case vide, ou entree de la meme cle
+                break
+            if (ancienne >> 8) & 0xFF < profondeur_choisie:
+                choisie, profondeur_choisie = i, (ancienne >> 8) & 0xFF
+            i = (i + 1) & self.masque
+        cases[2 * choisie] = h ^ donnee
+        cases[2 * choisie + 1] = donnee
+
+    def vider(self):
+        self.memoire.buf[:self.capacite * self.OCTETS_PAR_CASE] = bytes(self.capacite * self.OCTETS_PAR_CASE)
+
+    def __len__(self):
+        cases = self.cases
+        return sum(1 for i in range(1, 2 * self.capacite, 2) if cases[i])
+
+    def statistiques(self):
+        entrees = len(self)
+        return {'entrees': entrees, 'taille_max': self.capacite, 'succes': self.succes, 'echecs': self.echecs,
+                'octets': self.capacite * self.OCTETS_PAR_CASE,
+                'octets_par_entree': self.capacite * self.OCTETS_PAR_CASE / entrees if entrees else None}
+
+    def fermer(self):
+        """
+        Detache ce processus du cache ; le processus qui l'a cree le detruit aussi
+        """
+        _CACHES_ATTACHES.pop(self.memoire.name, None)
+        self.cases.release()
+        self.memoire.close()
+        if self.proprietaire:
+            self.memoire.unlink()
+
+    def __del__(self):
+        # la vue sur la memoire doit etre liberee avant que SharedMemory ne la ferme
+        cases = getattr(self, 'cases', None)
+        if cases is not None:
+            cases.release()
+
+_CACHES_ATTACHES = {} # nom -> CachePartage deja attache dans ce processus
+
+################################################################################################################################################################
+
+class StatistiquesRecherche:
+    """
+    Compteurs d'une recherche (un coup) de StrategieMinMax :
+        - noeuds_par_profondeur : profondeur depuis la racine (1 : apres un coup) -> noeuds visites
+        - feuilles_terminales / feuilles_horizon : feuilles evaluees par le resultat final / par f1
+        - succes_table / echecs_table : entrees de la table de transposition utilisees / absentes ou inutilisables
+        - temps_generation, temps_evaluation, temps_coups : temps passe dans coupsPossibles, dans
+          f1 et estFini, dans joueLeCoup et annuleLeCoup (si chronometrer vaut True, voir JeuChronometre)
+        - temps_total : duree du coup
+    """
+    def __init__(self, chronometrer=False):
+        self.chronometrer = chronometrer
+        self.noeuds_par_profondeur = {}
+        self.feuilles_terminales = 0
+        self.feuilles_horizon = 0
+        self.succes_table = 0
+        self.echecs_table = 0
+        self.temps_generation = 0.0
+        self.temps_evaluation = 0.0
+        self.temps_coups = 0.0
+        self.temps_total = 0.0
+
+    def noeuds(self):
+        return sum(self.noeuds_par_profondeur.values())
+
+    def facteurBranchement(self):
+        """
+        Rend le facteur de branchement effectif b : un arbre uniforme de facteur b et de la meme
+        profondeur aurait autant de noeuds (b + b^2 + ... + b^d = noeuds)
+        """
+        n = self.noeuds()
+        if n == 0:
+            return 0.0
+        d = max(self.noeuds_par_profondeur)
+        bas, haut = 0.0, float(n)
+        for _ in range(100): # dichotomie
+            b = (bas + haut) / 2
+            if sum(b ** i for i in range(1, d + 1)) < n:
+                bas = b
+            else:
+                haut = b
+        return (bas + haut) / 2
+
+    def ajouter(self, autre):
+        """
+        Ajoute les compteurs d'autre (ex : ceux d'un processus de la recherche parallele)
+        """
+        for p, nb in autre.noeuds_par_profondeur.items():
+            self.noeuds_par_profondeur[p] = self.noeuds_par_profondeur.get(p, 0) + nb
+        self.feuilles_terminales += autre.feuilles_terminales
+        self.feuilles_horizon += autre.feuilles_horizon
+        self.succes_table += autre.succes_table
+        self.echecs_table += autre.echecs_table
+        self.temps_generation += autre.temps_generation
+        self.temps_evaluation += autre.temps_evaluation
+        self.temps_coups += autre.temps_coups
+
+    def resume(self):
+        return {'noeuds': self.noeuds(), 'noeuds_par_profondeur': dict(sorted(self.noeuds_par_profondeur.items())),
+                'facteur_branchement': self.facteurBranchement(),
+                'feuilles_terminales': self.feuilles_terminales, 'feuilles_horizon': self.feuilles_horizon,
+                'succes_table': self.succes_table, 'echecs_table': self.echecs_table,
+                'temps_generation': self.temps_generation, 'temps_evaluation': self.temps_evaluation,
+                'temps_coups': self.temps_coups, 'temps_total': self.temps_total}
+
+    def __repr__(self):
+        return "StatistiquesRecherche(" + ", ".join(f"{cle}={val}" for cle, val in self.resume().items()) + ")"
+
+
+class JeuChronometre:
+    """
+    Enveloppe un jeu pour mesurer le temps passe dans ses methodes pendant une recherche
+    (voir StatistiquesRecherche). Les autres attributs sont ceux du jeu.
+    """
+    def __init__(self, jeu, stats):
+        self._jeu = jeu
+        self._stats = stats
+
+    def __getattr__(self, nom):
+        return getattr(self._jeu, nom)
+
+    def coupsPossibles(self, C):
+        debut = time.perf_counter()
+        coups = self._jeu.coupsPossibles(C)
+        self._stats.temps_generation += time.perf_counter() - debut
+        return coups
+
+    def f1(self, C):
+        debut = time.perf_counter()
+        val = self._jeu.f1(C)
+        self._stats.temps_evaluation += time.perf_counter() - debut
+        return val
+
+    def f1Fils(self, coups):
+        debut = time.perf_counter()
+        valeurs = self._jeu.f1Fils(coups)
+        self._stats.temps_evaluation += time.perf_counter() - debut
+        return valeurs
+
+    def estFini(self, C):
+        debut = time.perf_counter()
+        fin = self._jeu.estFini(C)
+        self._stats.temps_evaluation += time.perf_counter() - debut
+        return fin
+
+    def joueLeCoup(self, coup):
+        debut = time.perf_counter()
+        self._jeu.joueLeCoup(coup)
+        self._stats.temps_coups += time.perf_counter() - debut
+
+    def annuleLeCoup(self, coup):
+        debut = time.perf_counter()
+        self._jeu.annuleLeCoup(coup)
+        self._stats.temps_coups += time.perf_counter() - debut
+
+################################################################################################################################################################
+
+class Strategie:
+    """
+    Represente une strategie de jeu
+    rng est le generateur aleatoire utilise (un random.Random pour des parties
+    reproductibles), par defaut le module random
+    stats contient les StatistiquesRecherche du dernier coup (None si la strategie n'en tient pas)
+    """
+    def __init__(self,jeu:JeuSequentiel,rng=None):
+        self.jeu = jeu
+        self.rng = random if rng is None else rng
+        self.stats = None
+
+    def choisirProchainCoup(self, C):
+        """
+        Choisit un coup parmi les coups possibles dans la configuration C
+        """
+        raise NotImplementedError
+
+    def nom(self):
+        """
+        Rend le nom de la strategie et de ses parametres (enregistre dans un JournalParties)
+        """
+        return type(self).__name__
+    
+    def decision(self,jeu,listecv):
+        raise NotImplementedError
+        
+    def estimation(self,jeu,coup,profondeur):
+        raise NotImplementedError
+        
+    def maxValue(jeu,profondeur):
+        raise NotImplementedError
+    
+    def minValue(jeu,profondeur):
+        raise NotImplementedError       
+        
+################################################################################################################################################################    
+
+class StrategieAleatoire(Strategie):
+    """
+    Represente une strategie de jeu
+    """
+    def __init__(self,jeu:JeuSequentiel,rng=None):
+        super().__init__(jeu,rng)
+
+    def choisirProchainCoup(self, C):
+        """
+        Choisit un coup parmi les coups possibles dans la configuration C
+        """
+        coups_possibles=self.jeu.coupsPossibles(C)
+        if coups_possibles:
+            return self.rng.choice(coups_possibles)
+        else:
+            print("Aucun coup dispo")
+            return None
+
+################################################################################################################################################################
+
+class EtatRecherche:
+    """
+    Etat d'une recherche de StrategieMinMax (un appel a rechercher), passe de methode en methode :
+    la strategie elle-meme n'est pas modifiee pendant la recherche.
+        - joueur_racine : joueur qui cherche son coup (celui qui maximise)
+        - horizon : horizon de la recherche en cours (< k en approfondissement iteratif)
+        - limite : instant (time.perf_counter) ou la recherche doit s'arreter, None sans limite
+        - premier_coup : coup de la racine a evaluer en premier
+        - noeuds : nombre de noeuds visites
+        - stats : StatistiquesRecherche de la recherche, ou None
+        - lots : True si les feuilles de l'horizon sont evaluees par lots (evaluerFeuilles)
+    """
+    __slots__ = ('joueur_racine', 'horizon', 'limite', 'premier_coup', 'noeuds', 'stats', 'lots')
+
+    def __init__(self, joueur_racine, horizon, stats=None, lots=False):
+        self.joueur_racine = joueur_racine
+        self.horizon = horizon
+        self.limite = None
+        self.premier_coup = None
+        self.noeuds = 0
+        self.stats = stats
+        self.lots = lots
+
+class StrategieMinMax(Strategie):
+    """
+    Represente un strategie utilisant un arbre min-max de profondeur k
+    Si elagage vaut True, la recherche utilise l'elagage alpha-beta avec
+    un tri prealable des coups selon f1 (ou le score final du coup).
+    table est une TableTransposition (eventuellement partagee) ou None ; avec
+    processus > 1, chaque processus a sa propre table de meme taille, sauf si table
+    est un CachePartage (alors commun a tous les processus).
+    Si symetrie vaut True (jeux ayant canonique/hashCanonique, ex : Morpion),
+    un seul coup est explore parmi ceux menant a des configurations symetriques
+    et la table est indexee par le hash de la configuration canonique.
+    Si temps est donne, la recherche s'approfondit d'un coup a la fois (horizon 0, 1, ...
+    jusqu'a k) tant qu'il reste du temps, et joue le meilleur coup de la derniere
+    profondeur terminee (profondeur_atteinte).
+    Si statistiques vaut True, stats contient les StatistiquesRecherche de chaque coup
+    (avec les temps par methode du jeu si chronometrer vaut True). crochet(jeu, profondeur),
+    si donne, est appele a chaque noeud visite (dans le processus principal seulement).
+    Les feuilles de l'horizon sont evaluees par lots (evaluerFeuilles) si le jeu a sa propre
+    version de f1Fils, sauf avec un crochet.
+    L'etat d'une recherche est dans un EtatRecherche : plusieurs threads peuvent appeler
+    rechercher sur la meme strategie, chacun avec son propre jeu (les recherches paralleles,
+    processus > 1, passent alors l'une apres l'autre).
+    """
+    def __init__(self, jeu: JeuSequentiel, k: int, elagage=False, table=None, symetrie=False, rng=None, processus=1, temps=None,
+                 statistiques=False, chronometrer=False, crochet=None):
+        super().__init__(jeu, rng)
+        self.jeu = jeu
+        self.horizon=k
+        self.elagage=elagage
+        self.table=table
+        self.symetrie=symetrie
+        self.processus=processus # > 1 : coups de la racine repartis entre des processus
+        self.executeur=None
+        self.borne=None # meilleur score partage entre les processus
+        self.verrou=threading.Lock() # une recherche parallele a la fois (executeur et borne communs)
+        self.temps=temps # budget en secondes par coup (approfondissement iteratif), None : horizon fixe
+        self.profondeur_atteinte=None # horizon de la derniere recherche terminee
+        self.noeuds=0 # nombre de noeuds visites lors du dernier coup
+        self.statistiques=statistiques or chronometrer
+        self.chronometrer=chronometrer
+        self.crochet=crochet
+
+    def nom(self):
+        return f"StrategieMinMax(k={self.horizon}{', elagage' if self.elagage else ''}{', temps=' + str(self.temps) if self.temps is not None else ''})"
+        
+    def choisirProchainCoup(self, C):
+        return self.rechercher(self.jeu, C)
+
+    def rechercher(self, jeu, C=None):
+        """
+        Rend le coup choisi dans la configuration C (par defaut jeu.plateau) de jeu.
+        noeuds, stats et profondeur_atteinte decrivent ensuite la derniere recherche terminee.
+        """
+        debut=time.perf_counter()
+        if C is None:
+            C=jeu.plateau
+        stats=StatistiquesRecherche(self.chronometrer) if self.statistiques else None
+        etat=EtatRecherche(jeu.joueur,self.horizon,stats,self.evaluationParLots(jeu))
+        liste=jeu.coupsPossibles(C)
+        if stats is not None and self.chronometrer and self.processus==1:
+            jeu=JeuChronometre(jeu,stats)
+        if self.temps is None:
+            cp=self.decision(etat,jeu,liste)
+            profondeur=self.horizon
+        else:
+            cp,profondeur=self.approfondir(etat,jeu,liste)
+        if stats is not None:
+            stats.temps_total=time.perf_counter()-debut
+        self.noeuds,self.stats,self.profondeur_atteinte=etat.noeuds,stats,profondeur
+        return cp
+
+    def evaluationParLots(self,jeu):
+        """
+        Rend True si les feuilles de l'horizon sont evaluees par lots, ce qui est plus
+        rapide que coup par coup quand le jeu a sa propre version de f1Fils
+        """
+        return self.crochet is None and type(jeu).f1Fils is not JeuSequentiel.f1Fils
+        
+    def approfondir(self,etat,jeu,listecv):
+        """
+        Approfondissement iteratif : rend le coup choisi a la plus grande profondeur
+        terminee dans le temps imparti (la profondeur 0 va toujours a son terme), et cette profondeur.
+        """
+        debut=time.perf_counter()
+        cp=None
+        profondeur=None
+        for h in range(self.horizon+1):
+            etat.horizon=h
+            try:
+                cp=self.decision(etat,jeu,listecv)
+            except TempsEcoule:
+                break
+            profondeur=h
+            etat.premier_coup=cp # explore en premier a la profondeur suivante
+            etat.limite=debut+self.temps
+            if time.perf_counter()>=etat.limite:
+                break
+        return cp,profondeur
+
+    def decision(self,etat,jeu,listecv):
+        if self.symetrie:
+            representant=self.representants(jeu,listecv)
+            a_evaluer=[coup for coup in listecv if representant[coup]==coup]
+        else:
+            a_evaluer=listecv
+        if etat.premier_coup in a_evaluer:
+            a_evaluer=[etat.premier_coup]+[coup for coup in a_evaluer if coup!=etat.premier_coup]
+        if self.processus>1:
+            valeurs=self.evaluerRacineParallele(etat,jeu,a_evaluer)
+        else:
+            valeurs=self.evaluerRacine(etat,jeu,a_evaluer)
+        # Un coup symetrique d'un autre a la meme valeur (exacte si elle egale max_score)
+        est_list=[valeurs[representant[coup] if self.symetrie else coup] for coup in listecv]
+        max_score=max(est_list)
+
+        best_list = []
+        for i in range(len(listecv)):
+            if est_list[i] == max_score:
+                best_list.append(listecv[i])
+        #print("BESTONE : ",score)
+        return self.rng.choice(best_list)
+
+    def evaluerRacine(self,etat,jeu,coups):
+        """
+        Rend le dictionnaire coup -> valeur des coups de la racine. Avec l'elagage, une valeur
+        inferieure au meilleur score n'est qu'une borne superieure de la vraie valeur.
+        """
+        max_score=-INFINI
+        valeurs={}
+        for coup in coups:
+            if self.elagage:
+                # Fenetre ]max_score, +inf[ : une valeur inferieure a max_score n'est qu'une borne,
+                # une valeur egale doit etre recalculee exactement pour garder les ex-aequo
+                val=self.estimation(etat,jeu,coup, etat.horizon, max_score, INFINI)
+                if val==max_score:
+                    val=self.estimation(etat,jeu,coup, etat.horizon)
+            else:
+                val=self.estimation(etat,jeu,coup, etat.horizon)
+            valeurs[coup]=val
+            #print(coup,val)
+            max_score=max(max_score,val)
+        return valeurs
+
+    def evaluerRacineParallele(self,etat,jeu,coups):
+        """
+        Comme evaluerRacine, mais chaque coup de la racine est evalue par un processus
+        du groupe de self.processus processus. Avec l'elagage, le meilleur score connu
+        est partage entre les processus et sert de borne alpha des qu'il augmente.
+        """
+        with self.verrou:
+            if self.executeur is None:
+                self.borne=multiprocessing.Value('d',-INFINI)
+                self.executeur=concurrent.futures.ProcessPoolExecutor(
+                    self.processus,initializer=_initialiserProcessusMinMax,initargs=(self.borne,))
+            self.borne.value=-INFINI
+            parametres=(etat.horizon,self.elagage,self.symetrie,
+                        None if self.table is None else _descripteurTable(self.table),etat.limite,
+                        None if etat.stats is None else self.chronometrer)
+            taches=[self.executeur.submit(_estimationRacine,jeu,coup,etat.joueur_racine,parametres) for coup in coups]
+            valeurs={}
+            a_revoir=[]
+            try:
+                for coup,tache in zip(coups,taches):
+                    val,alpha,noeuds,stats=tache.result()
+                    etat.noeuds+=noeuds
+                    if stats is not None:
+                        etat.stats.ajouter(stats)
+                    valeurs[coup]=val
+                    if val<=alpha:
+                        a_revoir.append(coup) # val n'est qu'une borne superieure
+            except TempsEcoule:
+                for tache in taches:
+                    tache.cancel()
+                raise
+        # alpha n'a pris que des valeurs exactes : le maximum est exact, seules
+        # les bornes egales au maximum doivent etre recalculees (ex-aequo possibles)
+        max_score=max(valeurs.values())
+        for coup in a_revoir:
+            if valeurs[coup]==max_score:
+                valeurs[coup]=self.estimation(etat,jeu,coup,etat.horizon)
+        return valeurs
+
+    def fermer(self):
+        """
+        Arrete les processus de la recherche parallele
+        """
+        if self.executeur is not None:
+            self.executeur.shutdown()
+            self.executeur=None
+
+    def estimation(self,etat,jeu,coup,profondeur,alpha=-INFINI,beta=INFINI):
+        """
+        Joue le coup sur jeu, evalue la configuration obtenue puis annule le coup
+        """
+        jeu.joueLeCoup(coup)
+        try:
+            return self.evaluerConfiguration(etat,jeu,profondeur,alpha,beta)
+        finally:
+            jeu.annuleLeCoup(coup)
+
+    def evaluerConfiguration(self,etat,jeu,profondeur,alpha,beta):
+        etat.noeuds+=1
+        stats=etat.stats
+        if stats is not None:
+            p=etat.horizon-profondeur+1 # les fils de la racine sont evalues a la profondeur horizon
+            stats.noeuds_par_profondeur[p]=stats.noeuds_par_profondeur.get(p,0)+1
+        if self.crochet is not None:
+            self.crochet(jeu,profondeur)
+        if etat.limite is not None and time.perf_counter()>etat.limite:
+            raise TempsEcoule
+        if profondeur==0:
+            if stats is not None:
+                stats.feuilles_horizon+=1
+            #return self.evaluation(jeu)
+            return jeu.f1(jeu.plateau)
+        result=jeu.estFini(jeu.plateau)
+        if result:
+            if stats is not None:
+                stats.feuilles_terminales+=1
+            return self.scoreFinal(result)
+        if self.table is not None:
+            cle=(jeu.hashCanonique(jeu.plateau) if self.symetrie else jeu.hash,profondeur,etat.joueur_racine)
+            entree=self.table.chercher(cle)
+            if entree is not None:
+                val,type_val=entree
+                if type_val==TableTransposition.EXACTE \
+                        or (type_val==TableTransposition.INFERIEURE and val>=beta) \
+                        or (type_val==TableTransposition.SUPERIEURE and val<=alpha):
+                    if stats is not None:
+                        stats.succes_table+=1
+                    return val
+            if stats is not None:
+                stats.echecs_table+=1
+        if jeu.joueur == etat.joueur_racine:
+            val=self.maxValue(etat,jeu,profondeur,alpha,beta)
+        else :
+            val=self.minValue(etat,jeu,profondeur,alpha,beta)
+        if self.table is not None:
+            if val<=alpha:
+                type_val=TableTransposition.SUPERIEURE
+            elif val>=beta:
+                type_val=TableTransposition.INFERIEURE
+            else:
+                type_val=TableTransposition.EXACTE
+            self.table.stocker(cle,val,type_val)
+        return val
+
+    def scoreFinal(self,result):
+        """
+        Rend le score d'une configuration finale de resultat result
+        """
+        if result=='X':
+            return 100000 #bcp psq win condition
+        elif result=='O':
+            return -100000 #loose
+        else:
+            return -1000 #draw
+
+    def ordonnerCoups(self,jeu,liste,maximiser):
+        """
+        Trie les coups selon le score statique (f1 ou score final) de la configuration
+        obtenue, les meilleurs pour le joueur du noeud en premier.
+        """
+        scores={}
+        for c in liste:
+            jeu.joueLeCoup(c)
+            result=jeu.estFini(jeu.plateau)
+            scores[c]=self.scoreFinal(result) if result else jeu.f1(jeu.plateau)
+            jeu.annuleLeCoup(c)
+        return sorted(liste,key=scores.__getitem__,reverse=maximiser)
+
+    def representants(self,jeu,liste):
+        """
+        Rend le dictionnaire coup -> premier coup de liste menant a une configuration
+        symetrique de celle obtenue par coup
+        """
+        classes={}
+        representant={}
+        for c in liste:
+            jeu.joueLeCoup(c)
+            representant[c]=classes.setdefault(jeu.canonique(jeu.plateau),c)
+            jeu.annuleLeCoup(c)
+        return representant
+
+    def coupsDistincts(self,jeu,liste):
+        """
+        Rend les coups de liste a explorer : un seul par classe de symetrie si symetrie vaut True
+        """
+        if not self.symetrie:
+            return liste
+        return [c for c,r in self.representants(jeu,liste).items() if c==r]
+
+    def evaluerFeuilles(self,etat,jeu,maximiser,alpha,beta):
+        """
+        Rend la valeur d'un noeud de profondeur 1 : ses fils (feuilles de l'horizon) sont
+        evalues en un seul appel a jeu.f1Fils, puis parcourus comme dans maxValue/minValue
+        (avec les memes coupures). Les fils symetriques ont la meme valeur : inutile de
+        n'en garder qu'un par classe.
+        """
+        if etat.limite is not None and time.perf_counter()>etat.limite:
+            raise TempsEcoule
+        valeurs=jeu.f1Fils(jeu.coupsPossibles(jeu.plateau))
+        nb=len(valeurs)
+        if not self.elagage:
+            m=max(-100000,*valeurs) if maximiser else min(100000,*valeurs)
+        elif maximiser:
+            m=-100000
+            for nb,val in enumerate(valeurs,1):
+                if val>m:
+                    m=val
+                    if m>=beta:
+                        break
+        else:
+            m=100000
+            for nb,val in enumerate(valeurs,1):
+                if val<m:
+                    m=val
+                    if m<=alpha:
+                        break
+        etat.noeuds+=nb
+        stats=etat.stats
+        if stats is not None:
+            p=etat.horizon+1
+            stats.noeuds_par_profondeur[p]=stats.noeuds_par_profondeur.get(p,0)+nb
+            stats.feuilles_horizon+=nb
+        return m
+
+    def maxValue(self,etat,jeu,profondeur,alpha=-INFINI,beta=INFINI):
+        if profondeur==1 and etat.lots:
+            return self.evaluerFeuilles(etat,jeu,True,alpha,beta)
+        liste=self.coupsDistincts(jeu,jeu.coupsPossibles(jeu.plateau))
+        if self.elagage and profondeur>1:
+            liste=self.ordonnerCoups(jeu,liste,True)
         m=-100000
         for c in liste:
-            #jeuclone=game.getCopieJeu(jeu)
-            m = max(m,self.estimation(jeu,c,profondeur-1))
+            m = max(m,self.estimation(etat,jeu,c,profondeur-1,alpha,beta))
+            if self.elagage:
+                if m>=beta:
+                    return m
+                alpha=max(alpha,m)
         return m
 
-    def minValue(self,jeu,profondeur):
-        liste=jeu.coupsPossibles(jeu.plateau)
+    def minValue(self,etat,jeu,profondeur,alpha=-INFINI,beta=INFINI):
+        if profondeur==1 and etat.lots:
+            return self.evaluerFeuilles(etat,jeu,False,alpha,beta)
+        liste=self.coupsDistincts(jeu,jeu.coupsPossibles(jeu.plateau))
+        if self.elagage and profondeur>1:
+            liste=self.ordonnerCoups(jeu,liste,False)
         m=100000
         for c in liste:
-            #jeuclone=game.getCopieJeu(jeu)
-            m = min(m,self.estimation(jeu,c,profondeur-1))
+            m = min(m,self.estimation(etat,jeu,c,profondeur-1,alpha,beta))
+            if self.elagage:
+                if m<=alpha:
+                    return m
+                beta=min(beta,m)
         return m
 
+_borne_processus = None # meilleur score partage, dans les processus de la recherche parallele
+_table_processus = None # table de transposition propre a chaque processus
+
+def _descripteurTable(table):
+    """
+    Rend ce qu'il faut pour retrouver la table dans un processus : le meme cache partage,
+    ou une table locale de meme taille
+    """
+    if isinstance(table, CachePartage):
+        return ('partagee', table.memoire.name, table.capacite)
+    return ('locale', table.taille_max, table.politique)
+
+def _initialiserProcessusMinMax(borne):
+    global _borne_processus
+    _borne_processus = borne
+
+def _estimationRacine(jeu, coup, joueur_racine, parametres):
+    """
+    Evalue un coup de la racine dans un processus de StrategieMinMax.evaluerRacineParallele.
+    Rend (valeur, alpha utilise, noeuds visites, StatistiquesRecherche ou None).
+    """
+    global _table_processus
+    k, elagage, symetrie, table, limite, chronometrer = parametres
+    if table is not None and (_table_processus is None or _descripteurTable(_table_processus) != table):
+        _table_processus = CachePartage.attacher(*table[1:]) if table[0] == 'partagee' else TableTransposition(*table[1:])
+    strategie = StrategieMinMax(jeu, k, elagage, _table_processus if table is not None else None, symetrie)
+    etat = EtatRecherche(joueur_racine, k, None if chronometrer is None else StatistiquesRecherche(chronometrer),
+                         strategie.evaluationParLots(jeu))
+    etat.limite = limite
+    if chronometrer:
+        jeu = JeuChronometre(jeu, etat.stats)
+    alpha = _borne_processus.value if elagage else -INFINI
+    val = strategie.estimation(etat, jeu, coup, k, alpha, INFINI)
+    if elagage and val > alpha:
+        with _borne_processus.get_lock():
+            if val > _borne_processus.value:
+                _borne_processus.value = val
+    return val, alpha, etat.noeuds, etat.stats
+
 ################################################################################################################################################################
 
+class NoeudMCTS:
+    """
+    Noeud de l'arbre de StrategieMCTS. gains compte les parties gagnees (1 par victoire,
+    1/2 par egalite) par auteur, le joueur qui a joue le coup menant a ce noeud.
+    """
+    __slots__ = ('hash', 'auteur', 'a_explorer', 'enfants', 'visites', 'gains')
+
+    def __init__(self, jeu, auteur):
+        self.hash = jeu.hash
+        self.auteur = auteur
+        self.a_explorer = [] if jeu.estFini(jeu.plateau) else list(jeu.coupsPossibles(jeu.plateau))
+        self.enfants = {} # coup -> NoeudMCTS
+        self.visites = 0
+        self.gains = 0.0
+
+
+class StrategieMCTS(Strategie):
+    """
+    Recherche arborescente Monte-Carlo (UCT) pour tout JeuSequentiel ayant un hash.
+    A chaque iteration, on descend dans l'arbre (UCB1 de constante c), on ajoute un noeud,
+    puis on joue lot parties aleatoires depuis ce noeud : ensemble, en un appel a
+    jeu.partiesAleatoires, si le jeu en a une version (avec numpy) et si lot atteint
+    jeu.LOT_ALEATOIRES, sinon une a une avec StrategieAleatoire.
+    Le budget est de iterations iterations, ou de temps secondes si temps est donne.
+    L'arbre est conserve d'un coup a l'autre : le noeud de la configuration courante
+    (apres notre coup et celui de l'adversaire) devient la nouvelle racine.
+    """
+    def __init__(self, jeu: JeuSequentiel, iterations=1000, temps=None, c=math.sqrt(2), lot=8, rng=None):
+        super().__init__(jeu, rng)
+        self.iterations = iterations
+        self.temps = temps
+        self.c = c
+        self.lot = lot
+        self.politique = StrategieAleatoire(jeu, self.rng)
+        self.generateur = None # tirages numpy des parties jouees ensemble
+        if np is not None and type(jeu).partiesAleatoires is not JeuSequentiel.partiesAleatoires and lot >= jeu.LOT_ALEATOIRES:
+            self.generateur = np.random.default_rng(self.rng.getrandbits(64))
+        self.racine = None
+        self.simulations = 0 # parties aleatoires jouees lors du dernier coup
+
+    def nom(self):
+        budget = f"temps={self.temps}" if self.temps is not None else f"iterations={self.iterations}"
+        return f"StrategieMCTS({budget}, c={self.c:.3g}, lot={self.lot})"
+
+    def choisirProchainCoup(self, C):
+        jeu = self.jeu
+        if jeu.estFini(C):
+            return None # partie finie : aucun coup
+        self.racine = self.retrouverRacine(jeu)
+        self.simulations = 0
+        if self.temps is None:
+            for _ in range(self.iterations):
+                self.iteration(jeu)
+        else:
+            limite = time.perf_counter() + self.temps
+            while True:
+                self.iteration(jeu)
+                if time.perf_counter() >= limite:
+                    break
+        coup, _ = max(self.racine.enfants.items(), key=lambda e: e[1].visites)
+        return coup
+
+    def retrouverRacine(self, jeu):
+        """
+        Rend le noeud de l'ancien arbre correspondant a la configuration courante,
+        ou un nouveau noeud
+        """
+        if self.racine is not None:
+            if self.racine.hash == jeu.hash:
+                return self.racine
+            for enfant in self.racine.enfants.values():
+                for petit_enfant in enfant.enfants.values():
+                    if petit_enfant.hash == jeu.hash:
+                        return petit_enfant
+        return NoeudMCTS(jeu, 'O' if jeu.joueur == 'X' else 'X')
+
+    def selection(self, noeud):
+        """
+        Rend le couple (coup, enfant) maximisant UCB1
+        """
+        log_n = math.log(noeud.visites)
+        c = self.c
+        return max(noeud.enfants.items(),
+                   key=lambda e: e[1].gains / e[1].visites + c * math.sqrt(log_n / e[1].visites))
+
+    def iteration(self, jeu):
+        noeud = self.racine
+        chemin = [noeud]
+        coups = []
+        try:
+            while not noeud.a_explorer and noeud.enfants:
+                coup, noeud = self.selection(noeud)
+                jeu.joueLeCoup(coup)
+                coups.append(coup)
+                chemin.append(noeud)
+            if noeud.a_explorer:
+                a_explorer = noeud.a_explorer
+                i = self.rng.randrange(len(a_explorer))
+                coup = a_explorer[i]
+                a_explorer[i] = a_explorer[-1]
+                a_explorer.pop()
+                auteur = jeu.joueur
+                jeu.joueLeCoup(coup)
+                coups.append(coup)
+                enfant = NoeudMCTS(jeu, auteur)
+                noeud.enfants[coup] = enfant
+                chemin.append(enfant)
+            victoires = self.simulerLot(jeu)
+        finally:
+            for coup in reversed(coups):
+                jeu.annuleLeCoup(coup)
+        egalites = victoires[None] / 2
+        for noeud in chemin:
+            noeud.visites += self.lot
+            noeud.gains += victoires[noeud.auteur] + egalites
+
+    def simulerLot(self, jeu):
+        """
+        Joue lot parties aleatoires depuis la configuration courante (le jeu est
+        remis en l'etat) et rend le nombre de victoires de 'X', de 'O' et d'egalites (None)
+        """
+        victoires = {'X': 0, 'O': 0, None: 0}
+        fin = jeu.estFini(jeu.plateau)
+        if fin:
+            victoires[fin if type(fin) == str else None] = self.lot # configuration finale
+            return victoires
+        self.simulations += self.lot
+        if self.generateur is not None:
+            victoires[None], victoires['X'], victoires['O'] = jeu.partiesAleatoires(self.lot, self.generateur)
+            return victoires
+        choisir = self.politique.choisirProchainCoup
+        for _ in range(self.lot):
+            coups = []
+            try:
+                while not fin:
+                    coup = choisir(jeu.plateau)
+                    jeu.joueLeCoup(coup)
+                    coups.append(coup)
+                    fin = jeu.estFini(jeu.plateau)
+            finally:
+                for coup in reversed(coups):
+                    jeu.annuleLeCoup(coup)
+            victoires[fin if type(fin) == str else None] += 1
+            fin = False
+        return victoires
+
+################################################################################################################################################################
+
+class StrategiePreuve(Strategie):
+    """
+    Recherche par nombres de preuve en profondeur d'abord (df-pn) : on cherche a prouver
+    que le joueur de la strategie gagne (contre toute defense), en developpant toujours la
+    configuration la plus facile a prouver ou a refuter. Le nombre de preuve (pn) d'une
+    configuration est le nombre minimal de feuilles a prouver gagnantes pour la prouver
+    gagnante, le nombre de refutation (dn) celui pour la prouver non gagnante (perdue ou
+    nulle). Chaque coup developpe au plus noeuds noeuds ; la table (hash -> pn, dn, travail)
+    est gardee d'un coup a l'autre et bornee a taille_max entrees : quand elle est pleine,
+    on garde la moitie, en commencant par les resultats prouves puis les plus couteux.
+    Si la configuration n'est pas prouvee gagnante, on joue le coup de repli (par defaut
+    StrategieMinMax d'horizon 3 avec elagage). resultat vaut GAGNEE, NON_GAGNEE ou INCONNUE.
+    """
+    GAGNEE, NON_GAGNEE, INCONNUE = 'gagnee', 'non gagnee', 'inconnue'
+
+    def __init__(self, jeu: JeuSequentiel, noeuds=100000, taille_max=1000000, repli=None, rng=None):
+        super().__init__(jeu, rng)
+        self.budget = noeuds
+        self.taille_max = taille_max
+        self.repli = repli if repli is not None else StrategieMinMax(jeu, 3, elagage=True, rng=self.rng)
+        self.table = {} # hash -> (pn, dn, noeuds developpes sous la configuration)
+        self.joueur_racine = None
+        self.noeuds = 0 # noeuds developpes lors du dernier coup
+        self.limite = noeuds # nombre de noeuds developpes auquel developper s'arrete
+        self.resultat = None # resultat prouve de la derniere configuration
+
+    def nom(self):
+        return f"StrategiePreuve(noeuds={self.budget}, repli={self.repli.nom()})"
+
+    def choisirProchainCoup(self, C):
+        jeu = self.jeu
+        if jeu.joueur != self.joueur_racine:
+            self.table.clear() # les nombres dependent du joueur qui cherche a gagner
+            self.joueur_racine = jeu.joueur
+        self.noeuds = 0
+        self.limite = self.budget
+        pn, dn = self.developper(jeu, INFINI, INFINI)
+        if pn == 0:
+            self.resultat = self.GAGNEE
+            return self.coupGagnant(jeu, C)
+        self.resultat = self.NON_GAGNEE if dn == 0 else self.INCONNUE
+        return self.repli.choisirProchainCoup(C)
+
+    def coupGagnant(self, jeu, C):
+        """
+        Rend un coup menant a une configuration prouvee gagnante, la configuration C l'etant.
+        Si aucun fils prouve n'est dans la table (entree remplacee ou evincee), les fils sont
+        redeveloppes, avec un budget double a chaque tour, jusqu'a en prouver un : il en
+        existe un, et sa preuve est finie.
+        """
+        coups = jeu.coupsPossibles(C)
+        for coup in coups:
+            jeu.joueLeCoup(coup)
+            entree = self.table.get(jeu.hash)
+            jeu.annuleLeCoup(coup)
+            if entree is not None and entree[0] == 0:
+                return coup
+        budget = self.budget
+        while True:
+            for coup in coups:
+                self.limite = self.noeuds + budget
+                jeu.joueLeCoup(coup)
+                try:
+                    pn, _ = self.developper(jeu, INFINI, INFINI)
+                finally:
+                    jeu.annuleLeCoup(coup)
+                if pn == 0:
+                    return coup
+            budget *= 2
+
+    def developper(self, jeu, seuil_pn, seuil_dn):
+        """
+        Developpe la configuration courante jusqu'a ce que son pn atteigne seuil_pn ou son dn
+        seuil_dn (ou que le budget soit epuise), et rend (pn, dn)
+        """
+        self.noeuds += 1
+        debut = self.noeuds
+        fin = jeu.estFini(jeu.plateau)
+        if fin:
+            pn, dn = (0, INFINI) if fin == self.joueur_racine else (INFINI, 0)
+            self.stocker(jeu.hash, pn, dn, 0)
+            return pn, dn
+        ou = jeu.joueur == self.joueur_racine # noeud OU : il suffit d'un coup gagnant
+        fils = []
+        for coup in jeu.coupsPossibles(jeu.plateau):
+            jeu.joueLeCoup(coup)
+            fils.append((coup, jeu.hash))
+            jeu.annuleLeCoup(coup)
+        table = self.table
+        while True:
+            # pn et dn des fils (1, 1 s'ils n'ont pas encore ete developpes)
+            nombres = [table.get(h, (1, 1, 0)) for _, h in fils]
+            if ou:
+                pn = min(n[0] for n in nombres)
+                dn = sum(n[1] for n in nombres)
+                cles = [n[0] for n in nombres]
+            else:
+                pn = sum(n[0] for n in nombres)
+                dn = min(n[1] for n in nombres)
+                cles = [n[1] for n in nombres]
+            if pn >= seuil_pn or dn >= seuil_dn or self.noeuds >= self.limite:
+                break
+            i = cles.index(min(cles))
+            second = min(cles[:i] + cles[i + 1:], default=INFINI)
+            pn_fils, dn_fils, _ = nombres[i]
+            coup = fils[i][0]
+            jeu.joueLeCoup(coup)
+            try:
+                if ou:
+                    self.developper(jeu, min(seuil_pn, second + 1), seuil_dn - dn + dn_fils)
+                else:
+                    self.developper(jeu, seuil_pn - pn + pn_fils, min(seuil_dn, second + 1))
+            finally:
+                jeu.annuleLeCoup(coup)
+        self.stocker(jeu.hash, pn, dn, self.noeuds - debut)
+        return pn, dn
+
+    def stocker(self, h, pn, dn, travail):
+        table = self.table
+        table[h] = (pn, dn, travail)
+        if len(table) > self.taille_max:
+            gardees = sorted(table.items(), key=lambda e: (e[1][0] != 0 and e[1][1] != 0, -e[1][2]))
+            table.clear()
+            table.update(gardees[:self.taille_max // 2])
+
+################################################################################################################################################################
+
+def mex(valeurs):
+    """
+    Prend la premiere plus petite valeur possible qui n'est pas déjà dans la liste valeurs
+    """
+    valeurs.sort()
+    res = 0
+    for val in valeurs:
+        if val == res:
+            res += 1
+        elif val > res:
+            break
+    return res
+
+
+class TableGrundy:
+    """
+    Valeurs de Grundy d'un groupe seul quand on ne peut retirer que des quantités de retraits.
+    Une valeur ne dépend que des max(retraits) précédentes, donc la suite finit par être
+    périodique : le balayage (en O(n.|retraits|)) s'arrête dès que la période est trouvée, et
+    au-delà valeur(n) = valeur(preperiode + (n - preperiode) % periode) sans rien stocker.
+    La table peut être écrite sur disque puis ouverte en memory-map par d'autres processus.
+    """
+    MAGIQUE = b'GRDY'
+    ENTETE = struct.Struct('<4sBHQQQ') # magique, octets par valeur, nb de retraits, nb de valeurs, préperiode, période
+
+    def __init__(self, retraits, valeurs, preperiode=0, periode=0):
+        self.retraits = tuple(retraits)
+        self.valeurs = valeurs # liste, ou memoryview sur le fichier
+        self.preperiode = preperiode
+        self.periode = periode
+        self.fichier = None
+
+    def __len__(self):
+        return len(self.valeurs)
+
+    def __getitem__(self, n):
+        if n < len(self.valeurs):
+            return self.valeurs[n]
+        if self.periode:
+            return self.valeurs[self.preperiode + (n - self.preperiode) % self.periode]
+        raise IndexError("Table de Grundy calculée jusqu'à " + str(len(self.valeurs) - 1) + " seulement")
+
+    @classmethod
+    def construire(cls, retraits, n):
+        """
+        Calcule les valeurs pour les groupes de 0 à n allumettes, ou moins si la période
+        apparaît avant.
+        """
+        retraits = tuple(sorted(set(retraits)))
+        dernier = retraits[-1]
+        valeurs = []
+        vus = {} # max(retraits) valeurs consécutives -> indice de la valeur qui les suit
+        for taille in range(n + 1):
+            if taille >= dernier:
+                etat = tuple(valeurs[taille - dernier:])
+                if etat in vus:
+                    # valeurs[taille + t] == valeurs[vus[etat] + t] pour tout t, et les fenêtres sont égales
+                    preperiode = vus[etat] - dernier
+                    periode = taille - vus[etat]
+                    return cls(retraits, valeurs[:preperiode + periode], preperiode, periode)
+                vus[etat] = taille
+            valeurs.append(mex([valeurs[taille - j] for j in retraits if j <= taille]))
+        return cls(retraits, valeurs)
+
+    def ecrire(self, chemin):
+        taille_valeur = 1 if max(self.valeurs, default=0) < 256 else 2
+        valeurs = array.array('B' if taille_valeur == 1 else 'H', self.valeurs)
+        retraits = array.array('H', self.retraits)
+        if sys.byteorder == 'big':
+            valeurs.byteswap()
+            retraits.byteswap()
+        entete = self.ENTETE.pack(self.MAGIQUE, taille_valeur, len(self.retraits), len(self.valeurs),
+                                  self.preperiode, self.periode) + retraits.tobytes()
+        with open(chemin, 'wb') as f:
+            f.write(entete + bytes(-len(entete) % 8)) # valeurs alignées sur 8 octets
+            f.write(valeurs.tobytes())
+
+    @classmethod
+    def ouvrir(cls, chemin):
+        """
+        Ouvre une table écrite par ecrire, sans la recopier en mémoire (memory-map).
+        """
+        with open(chemin, 'rb') as f:
+            donnees = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magique, taille_valeur, nb_retraits, nb_valeurs, preperiode, periode = cls.ENTETE.unpack_from(donnees)
+        if magique != cls.MAGIQUE:
+            donnees.close()
+            raise ValueError(str(chemin) + " n'est pas une table de Grundy")
+        debut = cls.ENTETE.size + 2 * nb_retraits
+        retraits = struct.unpack_from('<' + 'H' * nb_retraits, donnees, cls.ENTETE.size)
+        debut += -debut % 8
+        valeurs = memoryview(donnees)[debut:debut + taille_valeur * nb_valeurs]
+        if taille_valeur == 2:
+            valeurs = valeurs.cast('H') # fichier en little-endian
+        table = cls(retraits, valeurs, preperiode, periode)
+        table.fichier = donnees
+        return table
+
+    @classmethod
+    def charger(cls, retraits, n, chemin):
+        """
+        Ouvre la table du fichier chemin, après l'avoir calculée et écrite si besoin.
+        """
+        if not os.path.exists(chemin):
+            cls.construire(retraits, n).ecrire(chemin)
+        table = cls.ouvrir(chemin)
+        if table.retraits != tuple(sorted(set(retraits))):
+            table.fermer()
+            raise ValueError(str(chemin) + " contient la table d'autres retraits : " + str(table.retraits))
+        return table
+
+    def fermer(self):
+        if self.fichier is not None:
+            self.valeurs.release()
+            self.fichier.close()
+            self.fichier = None
+
+
 class StrategieAllumettes(Strategie):
-    def __init__(self, jeu: Allumettes):
-        super().__init__(jeu)
-        self.valeurs_grundy = {}
-        
+    """
+    Strategie utilisant les valeurs de Grundy (theoreme de Sprague-Grundy) :
+    la valeur d'une configuration est le XOR des valeurs de ses groupes, et la
+    valeur d'un groupe seul ne depend que de son nombre d'allumettes.
+    Pour les variantes (jeu.retraits), les valeurs d'un groupe viennent de table
+    (une TableGrundy, par exemple ouverte depuis le disque) ou sont calculees en memoire.
+    """
+    def __init__(self, jeu: Allumettes, table=None, rng=None):
+        super().__init__(jeu, rng)
+        self.table = table
+        if jeu.retraits is not None:
+            if table is None:
+                self.table = TableGrundy.construire(jeu.retraits, max(jeu.plateau, default=0))
+            elif self.table.retraits != jeu.retraits:
+                raise ValueError("La table de Grundy ne correspond pas aux retraits du jeu")
+
+    def grundyGroupe(self, n):
+        """
+        Rend la valeur de Grundy d'un groupe seul de n allumettes
+        """
+        if self.table is None:
+            return n # on peut retirer ce que l'on veut : un groupe de n allumettes vaut n
+        try:
+            return self.table[n]
+        except IndexError:
+            self.table = TableGrundy.construire(self.jeu.retraits, 2 * n)
+            return self.table[n]
 
     def valeurGrundy(self, C):
-        if self.jeu.estFini(C):
-            return 0
-        if tuple(C) in self.valeurs_grundy:
-            return self.valeurs_grundy[tuple(C)]
-
-        valeurs_fils = [self.valeurGrundy(self.simuleCoup(C, coup)) for coup in self.jeu.coupsPossibles(C)]
-        val_grundy = self.premiere_petite_valeur(valeurs_fils)
-        self.valeurs_grundy[tuple(C)] = val_grundy  # Stockage dans la table
+        val_grundy = 0
+        if self.table is None:
+            for nb_allumettes in C:
+                val_grundy ^= nb_allumettes
+        else:
+            for nb_allumettes in C:
+                val_grundy ^= self.grundyGroupe(nb_allumettes)
         return val_grundy
 
     def premiere_petite_valeur(self, valeurs):
         """
         Prend la premiere plus petite valeur possible qui n'est pas déjà dans la liste valeurs
         """
-        valeurs.sort()
-        res = 0
-        for val in valeurs:
-            if val == res:
-                res += 1
+        return mex(valeurs)
+
+    def coupVersValeur(self, C, cible):
+        """
+        Rend le premier coup (dans l'ordre de coupsPossibles) menant a une configuration
+        de valeur de Grundy cible, ou None s'il n'y en a pas.
+        Pour le groupe i, il faut le remplacer par un groupe de valeur
+        valeurGrundy(C) ^ grundyGroupe(C[i]) ^ cible, le plus grand possible.
+        """
+        total = self.valeurGrundy(C)
+        for i, nb_allumettes in enumerate(C):
+            voulue = total ^ self.grundyGroupe(nb_allumettes) ^ cible
+            if self.table is None:
+                if voulue < nb_allumettes:
+                    return (i, nb_allumettes - voulue)
             else:
-                break
-        return res
+                for j in self.jeu.retraits:
+                    if j > nb_allumettes:
+                        break
+                    if self.grundyGroupe(nb_allumettes - j) == voulue:
+                        return (i, j)
+        return None
+
+    def coupGagnantVariante(self, C):
+        """
+        Rend le premier coup menant a une configuration perdante pour l'adversaire quand
+        les retraits sont limites, ou None. Celui qui prend la derniere allumette perd :
+        une configuration est perdante pour le joueur courant si le XOR des valeurs vaut 0
+        avec au moins un groupe de valeur >= 2, ou vaut 1 quand tous les groupes valent 0 ou 1
+        (verifie par recherche exhaustive pour plusieurs ensembles de retraits).
+        """
+        valeurs = [self.grundyGroupe(nb_allumettes) for nb_allumettes in C]
+        total = grands = 0
+        for val in valeurs:
+            total ^= val
+            grands += val >= 2
+        for i, nb_allumettes in enumerate(C):
+            for j in self.jeu.retraits:
+                if j > nb_allumettes:
+                    break
+                val = self.grundyGroupe(nb_allumettes - j)
+                total_apres = total ^ valeurs[i] ^ val
+                grands_apres = grands - (valeurs[i] >= 2) + (val >= 2)
+                if (total_apres == 0 and grands_apres) or (total_apres == 1 and not grands_apres):
+                    return (i, j)
+        return None
 
     def choisirProchainCoup(self, C):
-        coups = self.jeu.coupsPossibles(C)
-        for coup in coups:
-            if self.valeurGrundy(self.simuleCoup(C, coup)) == 1:
-                return coup
-        import random
-        return random.choice(coups)  # Si aucun coup avec valeur de Grundy 1, choisir au hasard
+        # Celui qui prend la derniere allumette perd : on annule le XOR des valeurs de Grundy,
+        # sauf si le coup ne laisse que des groupes de 0 ou 1 allumette, ou il faut alors
+        # laisser un nombre impair de groupes de 1 allumette
+        grands = [i for i, nb_allumettes in enumerate(C) if nb_allumettes > 1]
+        if self.table is not None:
+            coup = self.coupGagnantVariante(C)
+        elif len(grands) == 1:
+            i = grands[0]
+            uns = sum(1 for nb_allumettes in C if nb_allumettes == 1)
+            return (i, C[i] if uns % 2 else C[i] - 1)
+        elif grands:
+            coup = self.coupVersValeur(C, 0)
+        else:
+            coup = next(((i, 1) for i, nb_allumettes in enumerate(C) if nb_allumettes), None) if C.count(1) % 2 == 0 else None
+        if coup is not None:
+            return coup
+        return self.rng.choice(self.jeu.coupsPossibles(C))  # Si aucun coup gagnant, choisir au hasard
 
     def simuleCoup(self, C, coup):
         """Simule un coup sans modifier le plateau actuel."""
@@ -395,6 +2282,374 @@ class StrategieAllumettes(Strategie):
         return nouveau_C
 
 
+################################################################################################################################################################
+
+class BaseRetrograde:
+    """
+    Base des valeurs exactes de toutes les configurations accessibles depuis la
+    configuration courante d'un jeu (petits jeux : Morpion, petites Allumettes).
+    Pour chaque numero de configuration (jeu.rang) on stocke dans des tableaux :
+        - resultats : gagnant en jeu parfait (GAGNE_X, GAGNE_O, NULLE), INCONNUE si non accessible
+        - distances : nombre de coups avant la fin en jeu parfait (le gagnant va au plus vite,
+          le perdant au plus lent)
+        - coups : indice du meilleur coup dans jeu.coupsPossibles
+    """
+    INCONNUE, GAGNE_X, GAGNE_O, NULLE = 0, 1, 2, 3
+
+    def __init__(self, jeu: JeuSequentiel):
+        self.jeu = jeu
+        n = jeu.nombreRangs()
+        self.resultats = bytearray(n)
+        self.distances = array.array('H', bytes(2 * n))
+        self.coups = array.array('H', bytes(2 * n))
+        self.configurations = 0 # nombre de configurations accessibles
+
+    def resoudre(self):
+        """
+        Enumere les configurations accessibles (parcours en profondeur avec
+        joueLeCoup/annuleLeCoup), puis les resout de la fin vers le debut : chaque
+        configuration est traitee apres toutes ses configurations filles.
+        """
+        jeu = self.jeu
+        vues = bytearray(len(self.resultats))
+        fils = {} # rang -> rangs des configurations filles, dans l'ordre de coupsPossibles
+        joue_O = {} # rang -> True si O est le joueur courant
+        ordre = [] # configurations non finales, filles avant meres
+
+        def entrer(r):
+            # Rend True si la configuration courante (de rang r) reste a explorer
+            vues[r] = 1
+            self.configurations += 1
+            fin = jeu.estFini(jeu.plateau)
+            if fin:
+                self.resultats[r] = self.GAGNE_X if fin == 'X' else self.GAGNE_O if fin == 'O' else self.NULLE
+                return False
+            fils[r] = []
+            joue_O[r] = jeu.joueur == 'O'
+            pile.append((r, jeu.coupsPossibles(jeu.plateau), [0]))
+            return True
+
+        pile = []
+        entrer(jeu.rang(jeu.plateau))
+        while pile:
+            r, coups, suivant = pile[-1]
+            if suivant[0] == len(coups):
+                pile.pop()
+                ordre.append(r)
+                if pile:
+                    _, coups_pere, suivant_pere = pile[-1]
+                    jeu.annuleLeCoup(coups_pere[suivant_pere[0] - 1])
+                continue
+            coup = coups[suivant[0]]
+            suivant[0] += 1
+            jeu.joueLeCoup(coup)
+            r_fils = jeu.rang(jeu.plateau)
+            fils[r].append(r_fils)
+            if vues[r_fils] or not entrer(r_fils):
+                jeu.annuleLeCoup(coup)
+
+        for r in ordre:
+            gagnant = self.GAGNE_O if joue_O[r] else self.GAGNE_X
+            meilleur = None
+            for i, r_fils in enumerate(fils[r]):
+                resultat, distance = self.resultats[r_fils], self.distances[r_fils]
+                # on prefere gagner vite, puis annuler, puis perdre lentement
+                if resultat == gagnant:
+                    cle = (2, -distance)
+                elif resultat == self.NULLE:
+                    cle = (1, -distance)
+                else:
+                    cle = (0, distance)
+                if meilleur is None or cle > meilleur:
+                    meilleur = cle
+                    self.resultats[r], self.distances[r], self.coups[r] = resultat, distance + 1, i
+        return self
+
+    def resultat(self, C):
+        """
+        Rend le gagnant de C en jeu parfait ('X', 'O' ou 'EGALITE'), None si C est inconnue
+        """
+        return {self.GAGNE_X: 'X', self.GAGNE_O: 'O', self.NULLE: 'EGALITE'}.get(self.resultats[self.jeu.rang(C)])
+
+################################################################################################################################################################
+
+class StrategieBase(Strategie):
+    """
+    Strategie jouant parfaitement en lisant le meilleur coup dans une BaseRetrograde
+    (resolue a la creation si base n'est pas donnee).
+    """
+    def __init__(self, jeu: JeuSequentiel, base=None, rng=None):
+        super().__init__(jeu, rng)
+        self.base = base if base is not None else BaseRetrograde(jeu).resoudre()
+
+    def choisirProchainCoup(self, C):
+        r = self.jeu.rang(C)
+        coups = self.jeu.coupsPossibles(C)
+        if self.base.resultats[r] == BaseRetrograde.INCONNUE:
+            return self.rng.choice(coups) # configuration absente de la base
+        return coups[self.base.coups[r]]
+
+################################################################################################################################################################
+
+class ResultatPartie:
+    """
+    Resultat d'une partie jouee par jouerPartie :
+        - gagnant : 'X', 'O' ou 'EGALITE'
+        - coups : les coups joues, dans l'ordre
+        - latences : le temps (en secondes) mis par la strategie pour choisir chaque coup
+    """
+    def __init__(self, gagnant, coups, latences):
+        self.gagnant = gagnant
+        self.coups = coups
+        self.latences = latences
+
+    def temps(self, joueur=None):
+        """
+        Rend le temps total de reflexion (d'un seul joueur si joueur est donne)
+        """
+        if joueur is None:
+            return sum(self.latences)
+        return sum(self.latences[0 if joueur == 'X' else 1::2])
+
+    def __repr__(self):
+        return f"ResultatPartie({self.gagnant!r}, {len(self.coups)} coups, {self.temps():.4f} s)"
+
+################################################################################################################################################################
+
+def _ajouterVarint(tampon, n):
+    """
+    Ajoute a tampon (bytearray) l'entier positif n en varint : 7 bits par octet,
+    poids faibles d'abord, le bit de poids fort indiquant qu'un octet suit
+    """
+    while n >= 0x80:
+        tampon.append((n & 0x7F) | 0x80)
+        n >>= 7
+    tampon.append(n)
+
+
+def _lireVarint(donnees, position):
+    """
+    Rend (n, position apres n) pour le varint de donnees (bytes, mmap) a position
+    """
+    octet = donnees[position]
+    if octet < 0x80:
+        return octet, position + 1
+    n, decalage = octet & 0x7F, 7
+    while True:
+        position += 1
+        octet = donnees[position]
+        n |= (octet & 0x7F) << decalage
+        if octet < 0x80:
+            return n, position + 1
+        decalage += 7
+
+
+class JournalParties:
+    """
+    Journal binaire de parties, ecrit au fil des parties (jouerPartie(..., journal=...)).
+    Le fichier commence par un entete (magique, version, description JSON du jeu : classe
+    et parametres()), suivi d'enregistrements qui commencent par leur type :
+        - NOM : varint longueur, nom d'une strategie en UTF-8 (numerote 0, 1, ... dans l'ordre)
+        - PARTIE : resultat (octet 0 egalite, 1 X, 2 O), varints numero de la strategie de X,
+          de O, graine + 1 (0 : sans graine), nombre de coups, octets des coups, puis les coups
+          encodes par jeu.encoderCoup en varints (un octet par coup au morpion)
+    Les fichiers ne font que grandir : ouvrir un journal existant ajoute les parties a la fin
+    (une partie a moitie ecrite par un programme interrompu est effacee). Un seul journal
+    (processus ou thread) doit ecrire dans un fichier a la fois.
+    """
+    MAGIQUE = b'PART'
+    VERSION = 1
+    ENTETE = struct.Struct('<4sBI') # magique, version, longueur de la description
+    NOM, PARTIE = 0, 1
+    RESULTATS = ('EGALITE', 'X', 'O')
+
+    def __init__(self, chemin):
+        self.chemin = chemin
+        self.description = None
+        self.noms = {} # nom de strategie -> numero
+        self.parties = 0 # parties ecrites depuis l'ouverture
+        fin = 0
+        if os.path.exists(chemin) and os.path.getsize(chemin) > 0:
+            with LecteurJournal(chemin) as lecteur:
+                self.description = lecteur.description
+                self.noms = {nom: numero for numero, nom in enumerate(lecteur.noms)}
+                fin = lecteur.fin
+        self.fichier = open(chemin, 'r+b' if fin else 'wb')
+        self.fichier.truncate(fin)
+        self.fichier.seek(fin)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.fermer()
+
+    def ecrire(self, jeu, resultat, strategie_X, strategie_O, graine=None):
+        """
+        Ajoute la partie resultat (ResultatPartie) jouee au jeu jeu par les strategies de noms
+        strategie_X et strategie_O. graine est None ou un entier positif.
+        """
+        description = {'jeu': type(jeu).__name__, 'parametres': jeu.parametres()}
+        if self.description is None:
+            self.description = description
+            texte = json.dumps(description, sort_keys=True).encode()
+            self.fichier.write(self.ENTETE.pack(self.MAGIQUE, self.VERSION, len(texte)) + texte)
+        elif description != self.description:
+            raise ValueError("Le journal " + str(self.chemin) + " contient des parties de " + json.dumps(self.description))
+        if graine is not None and graine < 0:
+            raise ValueError("Graine negative : " + str(graine))
+        tampon = bytearray()
+        numeros = []
+        for nom in (strategie_X, strategie_O):
+            if nom not in self.noms:
+                texte = nom.encode()
+                tampon.append(self.NOM)
+                _ajouterVarint(tampon, len(texte))
+                tampon += texte
+                self.noms[nom] = len(self.noms)
+            numeros.append(self.noms[nom])
+        coups = bytearray()
+        for coup in resultat.coups:
+            _ajouterVarint(coups, jeu.encoderCoup(coup))
+        tampon.append(self.PARTIE)
+        tampon.append(self.RESULTATS.index(resultat.gagnant))
+        _ajouterVarint(tampon, numeros[0])
+        _ajouterVarint(tampon, numeros[1])
+        _ajouterVarint(tampon, 0 if graine is None else graine + 1)
+        _ajouterVarint(tampon, len(resultat.coups))
+        _ajouterVarint(tampon, len(coups))
+        tampon += coups
+        self.fichier.write(tampon) # un seul write par partie
+        self.parties += 1
+
+    def vider(self):
+        """
+        Ecrit sur disque les parties encore en memoire tampon
+        """
+        self.fichier.flush()
+
+    def fermer(self):
+        if not self.fichier.closed:
+            self.fichier.close()
+
+
+class LecteurJournal:
+    """
+    Lecture d'un JournalParties en memory-map : les parties sont decodees une a une
+    (iteration), sans charger le fichier en memoire.
+        - description : le jeu des parties ({'jeu': ..., 'parametres': ...})
+        - noms : les noms des strategies, par numero
+        - fin : position de la fin de la derniere partie complete
+    """
+    def __init__(self, chemin):
+        self.chemin = chemin
+        with open(chemin, 'rb') as f:
+            self.donnees = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magique, version, longueur = JournalParties.ENTETE.unpack_from(self.donnees)
+        if magique != JournalParties.MAGIQUE or version != JournalParties.VERSION:
+            self.donnees.close()
+            raise ValueError(str(chemin) + " n'est pas un journal de parties (version " + str(JournalParties.VERSION) + ")")
+        self.debut = JournalParties.ENTETE.size + longueur
+        self.description = json.loads(self.donnees[JournalParties.ENTETE.size:self.debut])
+        classe = globals().get(self.description['jeu'])
+        if not (isinstance(classe, type) and issubclass(classe, JeuSequentiel)):
+            self.donnees.close()
+            raise ValueError("Jeu inconnu : " + self.description['jeu'])
+        self.jeu = classe(**self.description['parametres']) # pour decoderCoup
+        self.noms = []
+        self.fin = self.debut
+        for _ in self._parties():
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.fermer()
+
+    def _parties(self):
+        """
+        Parcourt les enregistrements (en lisant les noms au passage) et rend pour chaque partie
+        (resultat, numero de X, numero de O, graine + 1, nombre de coups, debut des coups, fin des coups).
+        S'arrete a la premiere partie incomplete.
+        """
+        donnees = self.donnees
+        taille = len(donnees)
+        position = self.debut
+        nb_noms = 0
+        try:
+            while position < taille:
+                if donnees[position] == JournalParties.NOM:
+                    longueur, debut = _lireVarint(donnees, position + 1)
+                    if debut + longueur > taille:
+                        break
+                    if nb_noms == len(self.noms):
+                        self.noms.append(donnees[debut:debut + longueur].decode())
+                    nb_noms += 1
+                    position = debut + longueur
+                    self.fin = max(self.fin, position)
+                    continue
+                if donnees[position] != JournalParties.PARTIE:
+                    raise ValueError(str(self.chemin) + " : enregistrement inconnu a la position " + str(position))
+                resultat = donnees[position + 1]
+                x, p = _lireVarint(donnees, position + 2)
+                o, p = _lireVarint(donnees, p)
+                graine, p = _lireVarint(donnees, p)
+                nb_coups, p = _lireVarint(donnees, p)
+                octets, p = _lireVarint(donnees, p)
+                if p + octets > taille:
+                    break
+                position = p + octets
+                self.fin = max(self.fin, position)
+                yield resultat, x, o, graine, nb_coups, p, position
+        except IndexError:
+            pass # partie tronquee a la fin du fichier
+
+    def __iter__(self):
+        """
+        Rend pour chaque partie le tuple (gagnant, strategie de X, strategie de O, graine, coups)
+        """
+        donnees = self.donnees
+        decoder = self.jeu.decoderCoup
+        for resultat, x, o, graine, nb_coups, debut, _ in self._parties():
+            coups = []
+            for _ in range(nb_coups):
+                n, debut = _lireVarint(donnees, debut)
+                coups.append(decoder(n))
+            yield (JournalParties.RESULTATS[resultat], self.noms[x], self.noms[o],
+                   graine - 1 if graine else None, coups)
+
+    def statistiquesOuverture(self, strategie_X=None, strategie_O=None):
+        """
+        Rend pour chaque premier coup le dictionnaire des victoires de X, de O, des egalites,
+        du nombre de parties et du taux de victoire de X (parties des strategies de noms
+        strategie_X et strategie_O seulement, si donnes). Seul le premier coup de chaque
+        partie est decode.
+        """
+        numero_X = self.noms.index(strategie_X) if strategie_X in self.noms else None
+        numero_O = self.noms.index(strategie_O) if strategie_O in self.noms else None
+        if (strategie_X is not None and numero_X is None) or (strategie_O is not None and numero_O is None):
+            return {}
+        comptes = {} # premier coup (encode) -> [egalites, victoires de X, victoires de O]
+        donnees = self.donnees
+        for resultat, x, o, _, nb_coups, debut, _ in self._parties():
+            if nb_coups == 0 or (numero_X is not None and x != numero_X) or (numero_O is not None and o != numero_O):
+                continue
+            n = _lireVarint(donnees, debut)[0]
+            if n not in comptes:
+                comptes[n] = [0, 0, 0]
+            comptes[n][resultat] += 1
+        statistiques = {}
+        for n, compte in sorted(comptes.items()):
+            parties = sum(compte)
+            statistiques[self.jeu.decoderCoup(n)] = dict(_resultatsSimulation(compte), parties=parties, taux_X=compte[1] / parties)
+        return statistiques
+
+    def fermer(self):
+        if not self.donnees.closed:
+            self.donnees.close()
+
+
 """
 =================================================================================================================================================================================
 =================================================================================================================================================================================
@@ -440,268 +2695,360 @@ def morpionManuel():
         print("EGALITE")
 
 
-def morpionAleatoire(affichage=True):
-    jeu = Morpion()
-    strategie_joueur_X = StrategieAleatoire(jeu)
-    strategie_joueur_O = StrategieAleatoire(jeu)
-
-    while not jeu.estFini(jeu.plateau):
-        # Afficher le plateau
-        if affichage : jeu.afficher_plateau(jeu.plateau)
-        
-        # Obtenir les coups possibles
-        coups = jeu.coupsPossibles(jeu.plateau)
-        
-        # Choisir un coup aléatoire pour le joueur courant
-        if jeu.joueurCourant(jeu.plateau) == 'X':
-            if affichage : print("Au tour du joueur X de jouer !")
-            coup = strategie_joueur_X.choisirProchainCoup(jeu.plateau)
-        else:
-            if affichage : print("Au tour du joueur O de jouer !")
-            coup = strategie_joueur_O.choisirProchainCoup(jeu.plateau)
-        
-        # Jouer le coup
+def jouerPartie(fabrique_jeu, fabrique_X, fabrique_O, affichage=False, journal=None, graine=None):
+    """
+    Joue une partie du jeu fabrique_jeu() entre les strategies fabrique_X(jeu) et fabrique_O(jeu)
+    (ex : lambda jeu: StrategieMinMax(jeu, 3)) et rend son ResultatPartie.
+    Si affichage vaut True, le plateau est affiche avant chaque coup.
+    Si journal (JournalParties) est donne, la partie y est ajoutee avec graine.
+    """
+    jeu = fabrique_jeu()
+    strategies = {'X': fabrique_X(jeu), 'O': fabrique_O(jeu)}
+    coups = []
+    latences = []
+    horloge = time.perf_counter
+    fin = jeu.estFini(jeu.plateau)
+    while not fin:
+        joueur_courant = jeu.joueurCourant(jeu.plateau)
+        if affichage:
+            jeu.afficher_plateau(jeu.plateau)
+            print("Au tour du joueur", joueur_courant, "de jouer !")
+        debut = horloge()
+        coup = strategies[joueur_courant].choisirProchainCoup(jeu.plateau)
+        latences.append(horloge() - debut)
         jeu.joueLeCoup(coup)
-    
-    # La partie est finie, afficher le résultat
-    jeu.afficher_plateau(jeu.plateau)
-    print("La partie est finie!")
+        coups.append(coup)
+        fin = jeu.estFini(jeu.plateau)
+    gagnant = fin if type(fin) == str else 'EGALITE'
+    if affichage:
+        jeu.afficher_plateau(jeu.plateau)
+        print("La partie est finie!")
+        if gagnant == 'EGALITE':
+            print("EGALITE")
+        else:
+            print("Le joueur ", gagnant, " a gagné !")
+    resultat = ResultatPartie(gagnant, coups, latences)
+    if journal is not None:
+        journal.ecrire(jeu, resultat, strategies['X'].nom(), strategies['O'].nom(), graine)
+    return resultat
 
-    end=jeu.estFini(jeu.plateau)
-    if type(end)==str:
-        print("Le joueur ",end," a gagné !")
-    else:
-        print("EGALITE")
 
+def morpionAleatoire(affichage=True,graine=None,journal=None):
+    rng = random.Random(graine) if graine is not None else None
+    return jouerPartie(Morpion,
+                       lambda jeu: StrategieAleatoire(jeu, rng=rng),
+                       lambda jeu: StrategieAleatoire(jeu, rng=rng), affichage, journal, graine).gagnant
 
-def morpionMinMaxVSAlea(affichage = True,horizon=1):
-    jeu = Morpion()
-    strategie_joueur_X = StrategieMinMax(jeu,horizon)
-    strategie_joueur_O = StrategieAleatoire(jeu)
 
-    while not jeu.estFini(jeu.plateau):
-        # Afficher le plateau
-        if affichage : jeu.afficher_plateau(jeu.plateau)
-        
-        # Obtenir les coups possibles
-        coups = jeu.coupsPossibles(jeu.plateau)
-        
-        # Choisir un coup aléatoire pour le joueur courant
-        if jeu.joueurCourant(jeu.plateau) == 'X':
-            if affichage : print("Au tour du joueur X de jouer !")
-            coup = strategie_joueur_X.choisirProchainCoup(jeu.plateau)
-        else:
-            if affichage : print("Au tour du joueur O de jouer !")
-            coup = strategie_joueur_O.choisirProchainCoup(jeu.plateau)
-        
-        # Jouer le coup
-        jeu.joueLeCoup(coup)
-    
-    # La partie est finie, afficher le résultat
-    if affichage : jeu.afficher_plateau(jeu.plateau)
-    if affichage : print("La partie est finie!")
+def morpionMinMaxVSAlea(affichage = True,horizon=1,table=None,graine=None,journal=None):
+    rng = random.Random(graine) if graine is not None else None
+    return jouerPartie(Morpion,
+                       lambda jeu: StrategieMinMax(jeu, horizon, table=table, rng=rng),
+                       lambda jeu: StrategieAleatoire(jeu, rng=rng), affichage, journal, graine).gagnant
 
-    end=jeu.estFini(jeu.plateau)
-    if type(end)==str:
-        if affichage : print("Le joueur ",end," a gagné !")
-        return end
-    else:
-        if affichage : print("EGALITE")
-        return 'EGALITE'
 
+def morpionMinMaxNVSMinMax1(affichage = True,horizon=1,table=None,graine=None,journal=None):
+    rng = random.Random(graine) if graine is not None else None
+    return jouerPartie(Morpion,
+                       lambda jeu: StrategieMinMax(jeu, horizon, table=table, rng=rng),
+                       lambda jeu: StrategieMinMax(jeu, 1, table=table, rng=rng), affichage, journal, graine).gagnant
 
-def morpionMinMaxNVSMinMax1(affichage = True,horizon=1):
-    jeu = Morpion()
-    strategie_joueur_X = StrategieMinMax(jeu,horizon)
-    #strategie_joueur_X = StrategieAleatoire(jeu)
-    strategie_joueur_O = StrategieMinMax(jeu,1)
 
-    while not jeu.estFini(jeu.plateau):
-        # Afficher le plateau
-        if affichage : jeu.afficher_plateau(jeu.plateau)
-        
-        # Obtenir les coups possibles
-        coups = jeu.coupsPossibles(jeu.plateau)
-        
-        # Choisir un coup aléatoire pour le joueur courant
-        if jeu.joueurCourant(jeu.plateau) == 'X':
-            if affichage : print("Au tour du joueur X de jouer !")
-            coup = strategie_joueur_X.choisirProchainCoup(jeu.plateau)
-        else:
-            if affichage : print("Au tour du joueur O de jouer !")
-            coup = strategie_joueur_O.choisirProchainCoup(jeu.plateau)
-        
-        # Jouer le coup
-        jeu.joueLeCoup(coup)
-    
-    # La partie est finie, afficher le résultat
-    if affichage : jeu.afficher_plateau(jeu.plateau)
-    if affichage : print("La partie est finie!")
+def allumettesAleatoire(affichage = True,g=3,m=5,graine=None,journal=None):
+    rng = random.Random(graine) if graine is not None else None
+    return jouerPartie(lambda: Allumettes(g, m),
+                       lambda jeu: StrategieAleatoire(jeu, rng=rng),
+                       lambda jeu: StrategieAleatoire(jeu, rng=rng), affichage, journal, graine).gagnant
 
-    end=jeu.estFini(jeu.plateau)
-    if type(end)==str:
-        if affichage : print("Le joueur ",end," a gagné !")
-        return end
-    else:
-        if affichage : print("EGALITE")
-        return 'EGALITE'
 
+def allumettesGrundyVSAleatoire(affichage = True,g=3,m=5,graine=None,journal=None):
+    rng = random.Random(graine) if graine is not None else None
+    return jouerPartie(lambda: Allumettes(g, m),
+                       lambda jeu: StrategieAllumettes(jeu, rng=rng),
+                       lambda jeu: StrategieAleatoire(jeu, rng=rng), affichage, journal, graine).gagnant
 
-def allumettesAleatoire(affichage = True,g=3,m=5):
-    jeu = Allumettes(g,m)
-    strategie_joueur_X = StrategieAleatoire(jeu)
-    strategie_joueur_O = StrategieAleatoire(jeu)
 
-    while not jeu.estFini(jeu.plateau):
-        # Afficher le plateau
-        if affichage : jeu.afficher_plateau()
-        
-        # Obtenir les coups possibles
-        coups = jeu.coupsPossibles(jeu.plateau)
-        
-        # Choisir un coup aléatoire pour le joueur courant
-        if jeu.joueurCourant(jeu.plateau) == 'X':
-            if affichage : print("Au tour du joueur X de jouer !")
-            coup = strategie_joueur_X.choisirProchainCoup(jeu.plateau)
-        else:
-            if affichage : print("Au tour du joueur O de jouer !")
-            coup = strategie_joueur_O.choisirProchainCoup(jeu.plateau)
-        
-        # Jouer le coup
-        jeu.joueLeCoup(coup)
-    
-    # La partie est finie, afficher le résultat
-    if affichage : jeu.afficher_plateau()
-    if affichage : print("La partie est finie!")
-
-    end=jeu.estFini(jeu.plateau)
-    if type(end)==str:
-        if affichage : print("Le joueur ",end," a gagné !")
-        return end
-    else:
-        if affichage : print("EGALITE")
-        return 'EGALITE'
+def allumettesGrundyVSMinMax(affichage = True,g=3,m=5,horizon=1,table=None,graine=None,journal=None):
+    rng = random.Random(graine) if graine is not None else None
+    return jouerPartie(lambda: Allumettes(g, m),
+                       lambda jeu: StrategieAllumettes(jeu, rng=rng),
+                       lambda jeu: StrategieMinMax(jeu, horizon, table=table, rng=rng), affichage, journal, graine).gagnant
 
 
-def allumettesGrundyVSAleatoire(affichage = True,g=3,m=5):
-    jeu = Allumettes(g,m)
-    strategie_joueur_X = StrategieAllumettes(jeu)
-    strategie_joueur_O = StrategieAleatoire(jeu)
-    if affichage : jeu.afficher_plateau()
+def allumettesMinMaxVSAleatoire(affichage = True,g=5,m=5,horizon=1,table=None,graine=None,journal=None):
+    rng = random.Random(graine) if graine is not None else None
+    return jouerPartie(lambda: Allumettes(g, m),
+                       lambda jeu: StrategieMinMax(jeu, horizon, table=table, rng=rng),
+                       lambda jeu: StrategieAleatoire(jeu, rng=rng), affichage, journal, graine).gagnant
 
-    while not jeu.estFini(jeu.plateau):
-        # Afficher le plateau
-        
-        # Obtenir les coups possibles
-        coups = jeu.coupsPossibles(jeu.plateau)
-        
-        # Choisir un coup aléatoire pour le joueur courant
-        if jeu.joueurCourant(jeu.plateau) == 'X':
-            if affichage : print("Au tour du joueur X de jouer avec le plateau ci-dessous!")
-            if affichage : jeu.afficher_plateau()
 
-            coup = strategie_joueur_X.choisirProchainCoup(jeu.plateau)
-        else:
-            if affichage : print("Au tour du joueur O de jouer avec le plateau ci-dessous!")
-            if affichage : jeu.afficher_plateau()
+def _jouerPartieTournoi(args):
+    """
+    Joue une partie de tournoiParallele (fonction du module pour etre envoyee aux processus)
+    """
+    partie, graine, params = args
+    debut = time.perf_counter()
+    resultat = partie(affichage=False, graine=graine, **params)
+    return resultat, time.perf_counter() - debut
 
-            coup = strategie_joueur_O.choisirProchainCoup(jeu.plateau)
-        
-        # Jouer le coup
-        jeu.joueLeCoup(coup)
-    
-    # La partie est finie, afficher le résultat
-    if affichage : jeu.afficher_plateau()
-    if affichage : print("La partie est finie!")
 
-    end=jeu.estFini(jeu.plateau)
-    if type(end)==str:
-        if affichage : print("Le joueur ",end," a gagné !")
-        return end
+def tournoiParallele(partie, n=100, processus=None, graine=0, **params):
+    """
+    Joue n parties partie(affichage=False, graine=..., **params) (ex : partie=morpionMinMaxVSAlea,
+    horizon=3) reparties sur un groupe de processus (processus=None : un par coeur, 1 : sans processus).
+    Chaque partie a sa propre graine, tiree de graine : les resultats ne dependent pas
+    du nombre de processus. Avec plusieurs processus, seul un CachePartage peut etre donne
+    comme table : une TableTransposition serait copiee dans chaque processus et ses entrees
+    perdues (ValueError).
+    Rend un dictionnaire avec les victoires de X, de O, les egalites, les resultats
+    de chaque partie et les temps (moyen par partie, total des parties, duree reelle).
+    """
+    tirage = random.Random(graine)
+    taches = [(partie, tirage.getrandbits(64), params) for _ in range(n)]
+    debut = time.perf_counter()
+    if processus == 1:
+        parties = [_jouerPartieTournoi(tache) for tache in taches]
     else:
-        if affichage : print("EGALITE")
-        return 'EGALITE'
-
-
-def allumettesGrundyVSMinMax(affichage = True,g=3,m=5,horizon=1):
-    jeu = Allumettes(g,m)
-    strategie_joueur_X = StrategieAllumettes(jeu)
-    strategie_joueur_O = StrategieMinMax(jeu, horizon)
-    if affichage : jeu.afficher_plateau()
+        _verifierTableTournoi(params)
+        nb = processus or os.cpu_count() or 1
+        with concurrent.futures.ProcessPoolExecutor(nb) as executeur:
+            parties = list(executeur.map(_jouerPartieTournoi, taches, chunksize=max(1, n // (4 * nb))))
+    duree = time.perf_counter() - debut
+    resultats = [resultat for resultat, _ in parties]
+    temps_total = sum(temps for _, temps in parties)
+    return {'X': resultats.count('X'), 'O': resultats.count('O'), 'EGALITE': resultats.count('EGALITE'),
+            'resultats': resultats, 'temps_moyen': temps_total / n if n else 0.0,
+            'temps_total': temps_total, 'duree': duree}
+
+
+def _verifierTableTournoi(params):
+    """
+    Refuse une table de transposition qui ne serait pas partagee entre les processus d'un tournoi
+    """
+    table = params.get('table')
+    if table is not None and not isinstance(table, CachePartage):
+        raise ValueError("Avec plusieurs processus, la table doit etre un CachePartage (une "
+                         + type(table).__name__ + " serait copiee dans chaque processus)")
 
-    while not jeu.estFini(jeu.plateau):
-        # Afficher le plateau
-        
-        # Obtenir les coups possibles
-        coups = jeu.coupsPossibles(jeu.plateau)
-        
-        # Choisir un coup aléatoire pour le joueur courant
-        if jeu.joueurCourant(jeu.plateau) == 'X':
-            if affichage : print("Au tour du joueur X de jouer avec le plateau ci-dessous!")
-            if affichage : jeu.afficher_plateau()
 
-            coup = strategie_joueur_X.choisirProchainCoup(jeu.plateau)
+def _loiScore(frequences, score):
+    """
+    Rend la loi (defaite, egalite, victoire de X) de score moyen score la plus vraisemblable
+    au vu des frequences observees : p_i = f_i / (1 + t (x_i - score)), t trouve par dichotomie
+    """
+    ecarts = [x - score for x in (0, 0.5, 1)]
+    bas, haut = -1 / ecarts[2], -1 / ecarts[0]
+    for _ in range(100):
+        t = (bas + haut) / 2
+        if sum(f * e / (1 + t * e) for f, e in zip(frequences, ecarts)) > 0:
+            bas = t
         else:
-            if affichage : print("Au tour du joueur O de jouer avec le plateau ci-dessous!")
-            if affichage : jeu.afficher_plateau()
+            haut = t
+    return [f / (1 + t * e) for f, e in zip(frequences, ecarts)]
 
-            coup = strategie_joueur_O.choisirProchainCoup(jeu.plateau)
-        
-        # Jouer le coup
-        jeu.joueLeCoup(coup)
-    
-    # La partie est finie, afficher le résultat
-    if affichage : jeu.afficher_plateau()
-    if affichage : print("La partie est finie!")
 
-    end=jeu.estFini(jeu.plateau)
-    if type(end)==str:
-        if affichage : print("Le joueur ",end," a gagné !")
-        return end
-    else:
-        if affichage : print("EGALITE")
-        return 'EGALITE'
+def llrSprt(victoires_X, egalites, victoires_O, score0, score1):
+    """
+    Rend le log du rapport de vraisemblance (SPRT generalise) de l'hypothese « le score moyen
+    de X vaut score1 » contre « il vaut score0 », une victoire comptant 1, une egalite 1/2 et
+    une defaite 0. On ajoute un millieme de partie de chaque resultat, pour que la loi
+    de chaque hypothese existe meme tant qu'un seul resultat est sorti.
+    """
+    n = victoires_X + egalites + victoires_O
+    if n == 0:
+        return 0.0
+    comptes = (victoires_O + 1e-3, egalites + 1e-3, victoires_X + 1e-3)
+    frequences = [c / sum(comptes) for c in comptes]
+    loi0, loi1 = _loiScore(frequences, score0), _loiScore(frequences, score1)
+    return n * sum(f * math.log(p1 / p0) for f, p0, p1 in zip(frequences, loi0, loi1))
 
 
-def allumettesMinMaxVSAleatoire(affichage = True,g=5,m=5,horizon=1):
-    jeu = Allumettes(g,m)
-    strategie_joueur_X = StrategieMinMax(jeu, horizon)
-    strategie_joueur_O = StrategieAleatoire(jeu)
-    if affichage : jeu.afficher_plateau()
+def tournoiSequentiel(partie, n=1000, ecart=0.05, alpha=0.05, beta=0.05, processus=1, graine=0, **params):
+    """
+    Comme tournoiParallele, mais s'arrete des que le test sequentiel du rapport de vraisemblance
+    (SPRT) tranche entre « X est plus fort » (score moyen de X 0.5 + ecart) et « O est plus fort »
+    (0.5 - ecart), avec des risques d'erreur alpha et beta ; au plus n parties sont jouees.
+    Les graines sont celles de tournoiParallele(partie, n, graine=graine) : les parties jouees
+    sont les premieres de ce tournoi. Avec plusieurs processus, les parties sont lancees par
+    lots et celles du dernier lot qui suivent la decision ne sont pas comptees.
+    Rend le dictionnaire de tournoiParallele (sur les parties comptees), avec en plus :
+        - decision : 'X' ou 'O' (le plus fort), None si n parties n'ont pas suffi
+        - llr, bornes : le log du rapport de vraisemblance final et les bornes (basse, haute) du test
+        - economisees : nombre de parties evitees par rapport aux n parties
+    """
+    basse, haute = math.log(beta / (1 - alpha)), math.log((1 - beta) / alpha)
+    score0, score1 = 0.5 - ecart, 0.5 + ecart
+    tirage = random.Random(graine)
+    nb = 1 if processus == 1 else processus or os.cpu_count() or 1
+    if nb > 1:
+        _verifierTableTournoi(params)
+    executeur = concurrent.futures.ProcessPoolExecutor(nb) if nb > 1 else None
+    resultats, temps = [], []
+    comptes = {'X': 0, 'O': 0, 'EGALITE': 0}
+    decision, llr = None, 0.0
+    debut = time.perf_counter()
+    try:
+        while decision is None and len(resultats) < n:
+            taches = [(partie, tirage.getrandbits(64), params) for _ in range(min(2 * nb, n - len(resultats)))]
+            if executeur is None:
+                parties = map(_jouerPartieTournoi, taches) # une partie a la fois
+            else:
+                parties = executeur.map(_jouerPartieTournoi, taches)
+            for resultat, duree in parties:
+                resultats.append(resultat)
+                temps.append(duree)
+                comptes[resultat] += 1
+                llr = llrSprt(comptes['X'], comptes['EGALITE'], comptes['O'], score0, score1)
+                if llr >= haute or llr <= basse:
+                    decision = 'X' if llr >= haute else 'O'
+                    break
+    finally:
+        if executeur is not None:
+            executeur.shutdown(cancel_futures=True)
+    duree = time.perf_counter() - debut
+    joues = len(resultats)
+    return {'X': comptes['X'], 'O': comptes['O'], 'EGALITE': comptes['EGALITE'],
+            'resultats': resultats, 'temps_moyen': sum(temps) / joues if joues else 0.0,
+            'temps_total': sum(temps), 'duree': duree,
+            'decision': decision, 'llr': llr, 'bornes': (basse, haute), 'economisees': n - joues}
+
+
+def accelerationMinMax(fabrique_jeu, horizon, processus=(1, 2, 4, 8), elagage=True, repetitions=3):
+    """
+    Mesure le temps du premier coup de StrategieMinMax(fabrique_jeu(), horizon) selon le nombre de
+    processus de la recherche parallele (meilleur temps sur repetitions essais, processus deja lances).
+    Rend le dictionnaire processus -> (temps en secondes, acceleration par rapport au premier).
+    """
+    temps = {}
+    for nb in processus:
+        jeu = fabrique_jeu()
+        strategie = StrategieMinMax(jeu, horizon, elagage=elagage, processus=nb)
+        if nb > 1:
+            strategie.choisirProchainCoup(jeu.plateau) # lancement des processus
+        meilleur = INFINI
+        for _ in range(repetitions):
+            debut = time.perf_counter()
+            strategie.choisirProchainCoup(jeu.plateau)
+            meilleur = min(meilleur, time.perf_counter() - debut)
+        strategie.fermer()
+        temps[nb] = meilleur
+    reference = temps[processus[0]]
+    return {nb: (t, reference / t) for nb, t in temps.items()}
+
+
+def _resultatsSimulation(comptes):
+    """
+    Rend le dictionnaire X / O / EGALITE des comptes [egalites, victoires de X, victoires de O]
+    """
+    return {'X': int(comptes[1]), 'O': int(comptes[2]), 'EGALITE': int(comptes[0])}
 
-    while not jeu.estFini(jeu.plateau):
-        # Afficher le plateau
-        
-        # Obtenir les coups possibles
-        coups = jeu.coupsPossibles(jeu.plateau)
-        
-        # Choisir un coup aléatoire pour le joueur courant
-        if jeu.joueurCourant(jeu.plateau) == 'X':
-            if affichage : print("Au tour du joueur X de jouer avec le plateau ci-dessous!")
-            if affichage : jeu.afficher_plateau()
 
-            coup = strategie_joueur_X.choisirProchainCoup(jeu.plateau)
-        else:
-            if affichage : print("Au tour du joueur O de jouer avec le plateau ci-dessous!")
-            if affichage : jeu.afficher_plateau()
+_GAGNANTS_ORDRES_MORPION = None
 
-            coup = strategie_joueur_O.choisirProchainCoup(jeu.plateau)
-        
-        # Jouer le coup
-        jeu.joueLeCoup(coup)
-    
-    # La partie est finie, afficher le résultat
-    if affichage : jeu.afficher_plateau()
-    if affichage : print("La partie est finie!")
+def _gagnantsOrdresMorpion():
+    """
+    Rend le tableau (numpy) du gagnant (1 : X, 2 : O, 0 : egalite) pour chacun des 9! ordres
+    de remplissage des cases, numerotes comme itertools.permutations(range(9)).
+    Construit une seule fois.
+    """
+    global _GAGNANTS_ORDRES_MORPION
+    if _GAGNANTS_ORDRES_MORPION is None:
+        ordres = np.array(list(itertools.permutations(range(9))), dtype=np.int8)
+        # tour[p, c] : numero du coup (0 a 8) ou la case c est jouee dans l'ordre p (X aux tours pairs)
+        tour = np.empty_like(ordres)
+        np.put_along_axis(tour, ordres.astype(np.intp), np.arange(9, dtype=np.int8)[None, :], axis=1)
+        tours_lignes = tour[:, np.array(LIGNES_MORPION)]
+        parite = tours_lignes & 1
+        meme_joueur = (parite[:, :, 0] == parite[:, :, 1]) & (parite[:, :, 0] == parite[:, :, 2])
+        # l'alignement d'un meme joueur complete le plus tot decide de la partie
+        fin = np.where(meme_joueur, tours_lignes.max(axis=2), 9).min(axis=1)
+        _GAGNANTS_ORDRES_MORPION = np.where(fin == 9, 0, 1 + (fin & 1)).astype(np.int8)
+    return _GAGNANTS_ORDRES_MORPION
+
+
+def simulationMorpionAleatoire(n=1000000, graine=None, lot=1000000):
+    """
+    Joue n parties aleatoires de Morpion avec numpy, lot parties a la fois.
+    Jouer une case vide tiree uniformement a chaque coup (comme StrategieAleatoire) revient a
+    remplir les cases dans un ordre tire uniformement parmi les 9! : une partie est le tirage
+    d'un ordre, dont le gagnant est lu dans _gagnantsOrdresMorpion.
+    Rend les nombres de victoires de X, de O et d'egalites.
+    """
+    if np is None:
+        raise ImportError("simulationMorpionAleatoire demande numpy")
+    rng = np.random.default_rng(graine)
+    gagnants_ordres = _gagnantsOrdresMorpion()
+    comptes = np.zeros(3, dtype=np.int64)
+    for debut in range(0, n, lot):
+        taille = min(lot, n - debut)
+        comptes += np.bincount(gagnants_ordres[rng.integers(0, len(gagnants_ordres), taille)], minlength=3)
+    return _resultatsSimulation(comptes)
+
+
+def _typesAllumettes(total, retraits):
+    """
+    Rend le plus petit type entier numpy qui contient total (nombre d'allumettes) et le plus
+    grand retrait, et le tableau trie des retraits de ce type (None si on retire a volonte)
+    """
+    borne = max(total, max(retraits, default=0) if retraits is not None else 0)
+    entier = np.int16 if borne < 2 ** 15 else np.int32 if borne < 2 ** 31 else np.int64
+    return entier, None if retraits is None else np.array(sorted(set(retraits)), dtype=entier)
 
-    end=jeu.estFini(jeu.plateau)
-    if type(end)==str:
-        if affichage : print("Le joueur ",end," a gagné !")
-        return end
-    else:
-        if affichage : print("EGALITE")
-        return 'EGALITE'
 
+def _partiesAllumettes(groupes, retraits, generateur, entier):
+    """
+    Joue jusqu'a la fin les parties aleatoires du tableau groupes (une ligne par groupe, une
+    colonne par partie, de type entier), avancees d'un coup par etape ; les parties finies sont
+    retirees du tableau. Le coup (groupe, retrait) est tire uniformement parmi les coups possibles,
+    comme StrategieAleatoire. Rend les nombres de parties gagnees par le joueur qui joue le
+    premier coup et par l'autre.
+    """
+    g = groupes.shape[0]
+    comptes = [0, 0]
+    restantes = groupes.sum(axis=0, dtype=entier)
+    tour = 0
+    while groupes.shape[1]:
+        # nombre de coups possibles par groupe, puis numero du coup tire dans chaque partie
+        nb_coups = groupes.copy() if retraits is None else np.searchsorted(retraits, groupes, side='right')
+        tirage = (generateur.random(groupes.shape[1]) * nb_coups.sum(axis=0, dtype=entier)).astype(entier)
+        for i in range(g):
+            # le coup est dans le groupe i si 0 <= tirage < nb_coups[i]
+            choisi = (tirage >= 0) & (tirage < nb_coups[i])
+            if retraits is None:
+                retrait = np.where(choisi, tirage + 1, 0)
+            else:
+                retrait = np.where(choisi, retraits[np.clip(tirage, 0, len(retraits) - 1)], 0)
+            groupes[i] -= retrait.astype(entier)
+            restantes -= retrait
+            tirage -= nb_coups[i]
+        tour += 1
+        # le joueur qui doit jouer quand il n'y a plus d'allumettes gagne (voir Allumettes.estFini)
+        finis = restantes == 0
+        nb_finis = np.count_nonzero(finis)
+        if nb_finis:
+            comptes[tour % 2] += int(nb_finis)
+            groupes = groupes[:, ~finis]
+            restantes = restantes[~finis]
+    return comptes
+
+
+def simulationAllumettesAleatoire(n=1000000, g=3, m=5, retraits=None, graine=None, lot=100000):
+    """
+    Joue n parties aleatoires d'Allumettes(g, m, retraits) avec numpy, lot parties a la fois
+    (voir _partiesAllumettes).
+    Rend les nombres de victoires de X, de O et d'egalites (toujours 0).
+    """
+    if np is None:
+        raise ImportError("simulationAllumettesAleatoire demande numpy")
+    rng = np.random.default_rng(graine)
+    entier, retraits = _typesAllumettes(g * m, retraits)
+    comptes = np.zeros(3, dtype=np.int64)
+    for debut in range(0, n, lot):
+        groupes = np.full((g, min(lot, n - debut)), m, dtype=entier)
+        victoires_X, victoires_O = _partiesAllumettes(groupes, retraits, rng, entier)
+        comptes[1] += victoires_X
+        comptes[2] += victoires_O
+    return _resultatsSimulation(comptes)
 
 
 #allumettesGrundy()
\ No newline at end of file
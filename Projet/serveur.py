@@ -0,0 +1,362 @@
+"""
+Serveur de parties (Morpion, Allumettes, Puissance 4) pour de nombreuses parties simultanees,
+humain contre IA ou IA contre IA.
+
+    python serveur.py --port 8765 --processus 4     # lance le serveur (127.0.0.1 seulement)
+    python serveur.py --demo                        # serveur + client local : parties simultanees et metriques
+
+Protocole : une requete JSON par ligne, une reponse JSON par ligne (dans l'ordre des requetes).
+    {"type": "nouvelle", "jeu": "morpion", "X": "humain", "O": {"strategie": "minmax", "horizon": 3}}
+    {"type": "nouvelle", "jeu": "allumettes", "g": 3, "m": 5, "X": {"strategie": "grundy"}, "O": {"strategie": "mcts"}}
+    {"type": "nouvelle", "jeu": "puissance4", "lignes": 5, "colonnes": 5, "X": "humain", "O": {"strategie": "preuve"}}
+    {"type": "jouer", "partie": 1, "coup": 5}                   (Allumettes : "coup": [groupe, nombre])
+    {"type": "etat", "partie": 1}
+    {"type": "metriques"}                                       (toutes les parties, ou "partie": 1)
+Apres "nouvelle" et "jouer", le serveur joue les coups des IA jusqu'au tour d'un humain
+ou la fin de la partie, puis repond par l'etat de la partie (type "etat") ; en cas
+d'erreur la reponse est {"type": "erreur", "message": ...}.
+Les coups des IA sont calcules dans un groupe borne de processus ; au plus capacite calculs
+sont en attente a la fois, les autres requetes attendent (et leurs connexions ne sont plus lues).
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import itertools
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+from projet import *
+
+
+JEUX = {
+    'morpion': lambda parametres: Morpion(),
+    'allumettes': lambda parametres: Allumettes(parametres.get('g', 3), parametres.get('m', 5), parametres.get('retraits')),
+    'puissance4': lambda parametres: Puissance4(parametres.get('lignes', 6), parametres.get('colonnes', 7)),
+}
+PARAMETRES_JEUX = {'morpion': (), 'allumettes': ('g', 'm', 'retraits'), 'puissance4': ('lignes', 'colonnes')}
+
+
+def fabriquerJeu(nom, parametres, coups=()):
+    """
+    Rend le jeu nom apres les coups donnes
+    """
+    if nom not in JEUX:
+        raise ValueError("Jeu inconnu : " + str(nom))
+    jeu = JEUX[nom](parametres)
+    for coup in coups:
+        jeu.joueLeCoup(coup)
+    return jeu
+
+
+def fabriquerStrategie(jeu, description, rng):
+    """
+    Rend la strategie decrite par description, ex : {"strategie": "minmax", "horizon": 3, "elagage": true}
+    """
+    if not isinstance(description, dict):
+        raise ValueError("Strategie invalide (objet JSON ou \"humain\" attendu) : " + json.dumps(description))
+    nom = description.get('strategie')
+    if nom == 'aleatoire':
+        return StrategieAleatoire(jeu, rng)
+    if nom == 'minmax':
+        return StrategieMinMax(jeu, description.get('horizon', 3), elagage=description.get('elagage', True),
+                               table=_tableServeur(jeu), rng=rng, temps=description.get('temps'))
+    if nom == 'mcts':
+        return StrategieMCTS(jeu, description.get('iterations', 1000), temps=description.get('temps'), rng=rng)
+    if nom == 'preuve':
+        return StrategiePreuve(jeu, description.get('noeuds', 100000), rng=rng)
+    if nom == 'grundy' and isinstance(jeu, Allumettes):
+        return StrategieAllumettes(jeu, rng=rng)
+    raise ValueError("Strategie inconnue : " + str(description))
+
+
+_tables = {} # tables de transposition de chaque processus de calcul, une par jeu et parametres
+
+def _tableServeur(jeu):
+    cle = (type(jeu).__name__, json.dumps(jeu.parametres(), sort_keys=True))
+    if cle not in _tables:
+        _tables[cle] = TableTransposition(200000)
+    return _tables[cle]
+
+
+def coupIA(nom_jeu, parametres, coups, description, graine):
+    """
+    Calcule (dans un processus du groupe) le coup de l'IA decrite apres les coups joues.
+    Rend (coup, temps de calcul en secondes).
+    """
+    jeu = fabriquerJeu(nom_jeu, parametres, coups)
+    strategie = fabriquerStrategie(jeu, description, random.Random(graine))
+    debut = time.perf_counter()
+    coup = strategie.choisirProchainCoup(jeu.plateau)
+    return coup, time.perf_counter() - debut
+
+
+def resumeLatences(latences):
+    """
+    Rend nombre, moyenne, mediane, 95e centile et maximum des latences (en millisecondes)
+    """
+    if not latences:
+        return {'nombre': 0}
+    ordonnees = sorted(latences)
+    return {'nombre': len(ordonnees), 'moyenne_ms': 1000 * statistics.fmean(ordonnees),
+            'mediane_ms': 1000 * ordonnees[len(ordonnees) // 2],
+            'p95_ms': 1000 * ordonnees[min(len(ordonnees) - 1, int(0.95 * len(ordonnees)))],
+            'max_ms': 1000 * ordonnees[-1]}
+
+
+################################################################################################################################################################
+
+class Partie:
+    """
+    Partie hebergee par le serveur : le jeu (dans le processus du serveur, pour valider les coups
+    et rendre l'etat), les coups joues, les joueurs ('humain' ou description d'IA) et les latences
+    des coups des IA (attente du groupe de processus comprise) et de leur seul calcul.
+    """
+    def __init__(self, numero, nom_jeu, parametres, joueurs, graine):
+        self.numero = numero
+        self.nom_jeu = nom_jeu
+        self.parametres = parametres
+        self.jeu = fabriquerJeu(nom_jeu, parametres)
+        self.joueurs = joueurs
+        self.graine = graine
+        self.coups = []
+        self.latences = []
+        self.calculs = []
+        self.verrou = asyncio.Lock() # un seul coup a la fois par partie
+        self.debut = time.perf_counter()
+
+    def fin(self):
+        fin = self.jeu.estFini(self.jeu.plateau)
+        if not fin:
+            return None
+        return fin if type(fin) == str else 'EGALITE'
+
+    def jouer(self, coup):
+        self.jeu.joueLeCoup(coup)
+        self.coups.append(coup)
+
+    def etat(self):
+        return {'type': 'etat', 'partie': self.numero, 'jeu': self.nom_jeu, 'plateau': self.jeu.plateau,
+                'joueur': self.jeu.joueurCourant(self.jeu.plateau), 'coups': self.coups,
+                'coups_possibles': [] if self.fin() else self.jeu.coupsPossibles(self.jeu.plateau),
+                'fin': self.fin()}
+
+    def metriques(self):
+        return {'partie': self.numero, 'jeu': self.nom_jeu, 'coups': len(self.coups), 'fin': self.fin(),
+                'duree_s': time.perf_counter() - self.debut,
+                'latence_ia': resumeLatences(self.latences), 'calcul_ia': resumeLatences(self.calculs)}
+
+
+class ServeurJeux:
+    """
+    Serveur asyncio des parties. Les calculs des IA sont faits par processus processus,
+    avec au plus capacite calculs soumis a la fois (contre-pression).
+    """
+    def __init__(self, processus=None, capacite=None, graine=0):
+        self.executeur = concurrent.futures.ProcessPoolExecutor(processus)
+        self.capacite = capacite or 2 * (processus or os.cpu_count() or 1)
+        self.places = asyncio.Semaphore(self.capacite)
+        self.parties = {}
+        self.numeros = itertools.count(1)
+        self.tirage = random.Random(graine)
+        self.serveur = None
+        self.connexions = {} # tache -> ecrivain de chaque connexion ouverte
+
+    async def demarrer(self, hote='127.0.0.1', port=0):
+        self.serveur = await asyncio.start_server(self.connexion, hote, port)
+        return self.serveur.sockets[0].getsockname()[1]
+
+    async def arreter(self):
+        if self.serveur is not None:
+            self.serveur.close()
+        for ecrivain in list(self.connexions.values()):
+            ecrivain.close() # fin de lecture : chaque connexion se termine d'elle-meme
+        await asyncio.gather(*self.connexions, return_exceptions=True)
+        if self.serveur is not None:
+            await self.serveur.wait_closed()
+        self.executeur.shutdown()
+
+    async def connexion(self, lecteur, ecrivain):
+        self.connexions[asyncio.current_task()] = ecrivain
+        try:
+            while True:
+                ligne = await lecteur.readline()
+                if not ligne:
+                    break
+                try:
+                    reponse = await self.traiter(json.loads(ligne))
+                except Exception as erreur: # une requete invalide ne ferme pas la connexion
+                    reponse = {'type': 'erreur', 'message': str(erreur) or type(erreur).__name__}
+                ecrivain.write(json.dumps(reponse).encode() + b'\n')
+                await ecrivain.drain()
+        except ConnectionError:
+            pass
+        finally:
+            del self.connexions[asyncio.current_task()]
+            ecrivain.close()
+
+    async def traiter(self, requete):
+        if not isinstance(requete, dict):
+            raise ValueError("Requete invalide (objet JSON attendu) : " + json.dumps(requete))
+        genre = requete.get('type')
+        if genre == 'nouvelle':
+            joueurs = {'X': requete.get('X', 'humain'), 'O': requete.get('O', 'humain')}
+            parametres = {cle: requete[cle] for cle in PARAMETRES_JEUX.get(requete.get('jeu'), ()) if cle in requete}
+            partie = Partie(next(self.numeros), requete.get('jeu'), parametres, joueurs, self.tirage.getrandbits(32))
+            for description in joueurs.values():
+                if description != 'humain':
+                    fabriquerStrategie(partie.jeu, description, None) # description invalide : erreur tout de suite
+            self.parties[partie.numero] = partie
+            async with partie.verrou:
+                await self.jouerIA(partie)
+            return partie.etat()
+        if genre == 'jouer':
+            partie = self.partie(requete)
+            async with partie.verrou:
+                if partie.fin():
+                    raise ValueError("La partie est finie")
+                if partie.joueurs[partie.jeu.joueurCourant(partie.jeu.plateau)] != 'humain':
+                    raise ValueError("Ce n'est pas au tour d'un humain")
+                coup = requete['coup']
+                coup = tuple(coup) if isinstance(coup, list) else coup
+                if coup not in partie.jeu.coupsPossibles(partie.jeu.plateau):
+                    raise ValueError("Coup invalide : " + str(requete['coup']))
+                partie.jouer(coup)
+                await self.jouerIA(partie)
+            return partie.etat()
+        if genre == 'etat':
+            return self.partie(requete).etat()
+        if genre == 'metriques':
+            if 'partie' in requete:
+                return dict(type='metriques', **self.partie(requete).metriques())
+            return self.metriques()
+        raise ValueError("Requete inconnue : " + str(genre))
+
+    def partie(self, requete):
+        numero = requete.get('partie')
+        if numero not in self.parties:
+            raise ValueError("Partie inconnue : " + str(numero))
+        return self.parties[numero]
+
+    async def jouerIA(self, partie):
+        """
+        Joue les coups des IA jusqu'au tour d'un humain ou la fin de la partie
+        """
+        boucle = asyncio.get_running_loop()
+        while not partie.fin():
+            description = partie.joueurs[partie.jeu.joueurCourant(partie.jeu.plateau)]
+            if description == 'humain':
+                return
+            debut = time.perf_counter()
+            async with self.places:
+                coup, calcul = await boucle.run_in_executor(
+                    self.executeur, coupIA, partie.nom_jeu, partie.parametres, list(partie.coups),
+                    description, partie.graine + len(partie.coups))
+            partie.latences.append(time.perf_counter() - debut)
+            partie.calculs.append(calcul)
+            partie.jouer(coup)
+
+    def metriques(self):
+        parties = list(self.parties.values())
+        return {'type': 'metriques', 'parties': len(parties), 'finies': sum(1 for p in parties if p.fin()),
+                'capacite': self.capacite,
+                'latence_ia': resumeLatences([l for p in parties for l in p.latences]),
+                'calcul_ia': resumeLatences([c for p in parties for c in p.calculs]),
+                'par_partie': [p.metriques() for p in parties]}
+
+
+################################################################################################################################################################
+
+class ClientJeux:
+    """
+    Client local du serveur : une requete, une reponse
+    """
+    def __init__(self, lecteur, ecrivain):
+        self.lecteur = lecteur
+        self.ecrivain = ecrivain
+
+    @classmethod
+    async def connecter(cls, port, hote='127.0.0.1'):
+        lecteur, ecrivain = await asyncio.open_connection(hote, port)
+        return cls(lecteur, ecrivain)
+
+    async def requete(self, **message):
+        self.ecrivain.write(json.dumps(message).encode() + b'\n')
+        await self.ecrivain.drain()
+        return json.loads(await self.lecteur.readline())
+
+    async def fermer(self):
+        self.ecrivain.close()
+        await self.ecrivain.wait_closed()
+
+
+async def demo(parties=16, processus=None):
+    """
+    Lance un serveur local, y joue des parties IA contre IA simultanees et une partie humain
+    (coups aleatoires du client) contre IA, puis affiche les metriques
+    """
+    serveur = ServeurJeux(processus)
+    port = await serveur.demarrer()
+
+    async def partieIA(numero):
+        client = await ClientJeux.connecter(port)
+        if numero % 2:
+            etat = await client.requete(type='nouvelle', jeu='morpion', X={'strategie': 'minmax', 'horizon': 4},
+                                        O={'strategie': 'mcts', 'iterations': 300})
+        else:
+            etat = await client.requete(type='nouvelle', jeu='allumettes', g=4, m=5, X={'strategie': 'grundy'},
+                                        O={'strategie': 'minmax', 'horizon': 3})
+        await client.fermer()
+        return etat['fin']
+
+    async def partieHumain():
+        client = await ClientJeux.connecter(port)
+        tirage = random.Random(0)
+        etat = await client.requete(type='nouvelle', jeu='morpion', X='humain', O={'strategie': 'minmax', 'horizon': 3})
+        while not etat['fin']:
+            etat = await client.requete(type='jouer', partie=etat['partie'], coup=tirage.choice(etat['coups_possibles']))
+        await client.fermer()
+        return etat['fin']
+
+    debut = time.perf_counter()
+    resultats = await asyncio.gather(partieHumain(), *(partieIA(numero) for numero in range(parties)))
+    duree = time.perf_counter() - debut
+    client = await ClientJeux.connecter(port)
+    metriques = await client.requete(type='metriques')
+    await client.fermer()
+    await serveur.arreter()
+    print(len(resultats), "parties en", f"{duree:.2f} s :", resultats)
+    for cle in ('latence_ia', 'calcul_ia'):
+        print(cle, {nom: round(val, 2) for nom, val in metriques[cle].items()})
+    return metriques
+
+
+async def servir(port, processus, capacite):
+    serveur = ServeurJeux(processus, capacite)
+    port = await serveur.demarrer(port=port)
+    print("Serveur sur 127.0.0.1:" + str(port))
+    try:
+        await serveur.serveur.serve_forever()
+    finally:
+        await serveur.arreter()
+
+
+def main(arguments=None):
+    parseur = argparse.ArgumentParser(description="Serveur de parties de Morpion et d'Allumettes")
+    parseur.add_argument('--port', type=int, default=8765)
+    parseur.add_argument('--processus', type=int, help="processus de calcul des IA (defaut : un par coeur)")
+    parseur.add_argument('--capacite', type=int, help="calculs en attente au plus (defaut : 2 par processus)")
+    parseur.add_argument('--demo', action='store_true', help="joue des parties contre un serveur local et affiche les metriques")
+    args = parseur.parse_args(arguments)
+    if args.demo:
+        asyncio.run(demo(processus=args.processus))
+    else:
+        asyncio.run(servir(args.port, args.processus, args.capacite))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""
+Recherches MinMax simultanees (threads) : elles doivent jouer exactement comme en serie.
+
+    python -m pytest -q test_concurrence.py
+"""
+import concurrent.futures
+import random
+import sys
+
+from projet import *
+
+
+class PremierCoup:
+    """
+    Generateur "aleatoire" qui choisit toujours le premier element : le coup joue ne depend
+    alors pas de l'ordre dans lequel les threads tirent leurs nombres
+    """
+    def choice(self, liste):
+        return liste[0]
+
+
+def enThreads(fonction, arguments, threads=16):
+    """
+    Rend [fonction(a) for a in arguments], les appels etant faits simultanement dans des threads
+    qui changent tres souvent de main, en pleine recherche
+    """
+    intervalle = sys.getswitchinterval()
+    sys.setswitchinterval(1e-5)
+    try:
+        with concurrent.futures.ThreadPoolExecutor(threads) as executeur:
+            return list(executeur.map(fonction, arguments))
+    finally:
+        sys.setswitchinterval(intervalle)
+
+
+def partieConcurrence(numero, table):
+    """
+    Partie numero de l'essai de concurrence : MinMax d'horizons differents (comme
+    morpionMinMaxNVSMinMax1), avec une graine fixe et une table de transposition partagee
+    """
+    rng = random.Random(numero)
+    if numero % 2:
+        fabrique = lambda: Allumettes(3, 4)
+        horizons = (3, 1)
+    else:
+        fabrique = Morpion
+        horizons = (4, 1)
+    resultat = jouerPartie(fabrique,
+                           lambda jeu: StrategieMinMax(jeu, horizons[0], elagage=True, table=table, rng=rng),
+                           lambda jeu: StrategieMinMax(jeu, horizons[1], elagage=numero % 4 < 2, table=table, rng=rng))
+    return resultat.gagnant, resultat.coups
+
+
+def positionMorpion(numero):
+    """
+    Morpion apres au plus 4 coups aleatoires (graine numero), donc pas encore fini
+    """
+    rng = random.Random(numero)
+    jeu = Morpion()
+    for _ in range(rng.randrange(5)):
+        jeu.joueLeCoup(rng.choice(jeu.coupsPossibles(jeu.plateau)))
+    return jeu
+
+
+def test_parties_simultanees(parties=64, tours=3):
+    serie = [partieConcurrence(numero, TableTransposition()) for numero in range(parties)]
+    for _ in range(tours):
+        table = TableTransposition(taille_max=2000)
+        simultanees = enThreads(lambda numero: partieConcurrence(numero, table), range(parties))
+        differentes = [numero for numero in range(parties) if simultanees[numero] != serie[numero]]
+        assert differentes == [], f"parties differentes de la serie : {differentes}"
+
+
+def test_strategie_partagee(positions=48):
+    # une seule strategie (et sa table) cherche en meme temps sur des jeux differents
+    jeux = [positionMorpion(numero) for numero in range(positions)]
+    strategie = StrategieMinMax(Morpion(), 5, elagage=True, table=TableTransposition(), symetrie=True, rng=PremierCoup())
+    serie = [strategie.rechercher(jeu) for jeu in jeux]
+    etats = [(jeu.code, jeu.hash, jeu.joueur) for jeu in jeux]
+    strategie.table = TableTransposition(taille_max=2000)
+    simultanes = enThreads(strategie.rechercher, jeux)
+    assert simultanes == serie
+    # chaque recherche a annule ses coups : configuration, hash et trait inchanges
+    assert [(jeu.code, jeu.hash, jeu.joueur) for jeu in jeux] == etats